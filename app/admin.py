@@ -1,5 +1,8 @@
-from django.contrib import admin
-from .models import Skill, Project, Achievement, Experience, ContactMessage
+from django.contrib import admin, messages
+from django.utils.translation import ngettext
+from blog.search import SearchIndexAdminMixin
+from portfolio.paginator import EstimatedCountPaginator
+from .models import Skill, Project, Achievement, Experience, ContactMessage, OutboundEmail
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
@@ -22,10 +25,12 @@ class SkillAdmin(admin.ModelAdmin):
     )
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
     list_display = ['title', 'status', 'is_featured', 'order', 'created_at']
     list_filter = ['status', 'is_featured', 'is_personal']
+    # Answered from the full-text index on SQLite
     search_fields = ['title', 'description', 'short_description']
+    search_index_kind = 'project'
     list_editable = ['status', 'is_featured', 'order']
     ordering = ['order', '-created_at']
     
@@ -109,14 +114,21 @@ class ExperienceAdmin(admin.ModelAdmin):
     filter_horizontal = ['technologies_used']
 
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'subject', 'created_at', 'is_read', 'is_replied']
+    # The unread / unreplied filters and created_at ranges are indexed; no
+    # date_hierarchy, which scans the whole table for its distinct dates
     list_filter = ['is_read', 'is_replied', 'created_at']
+    # Answered from the full-text index on SQLite
     search_fields = ['name', 'email', 'subject', 'message']
+    search_index_kind = 'contact'
     readonly_fields = ['created_at', 'ip_address', 'user_agent']
     list_editable = ['is_read', 'is_replied']
-    date_hierarchy = 'created_at'
     ordering = ['-created_at']
+    actions = ['mark_read', 'mark_replied']
+    # No COUNT(*) over the whole table on every page
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Message Details', {
@@ -140,6 +152,30 @@ class ContactMessageAdmin(admin.ModelAdmin):
             return self.readonly_fields + ['name', 'email', 'subject', 'message', 'phone', 'company']
         return self.readonly_fields
 
+    @admin.action(description='Mark selected messages as read')
+    def mark_read(self, request, queryset):
+        # One UPDATE rather than mark_as_read() per row
+        updated = queryset.mark_read()
+        self.message_user(request, ngettext(
+            '%d message was marked as read.', '%d messages were marked as read.', updated,
+        ) % updated, messages.SUCCESS)
+
+    @admin.action(description='Mark selected messages as replied')
+    def mark_replied(self, request, queryset):
+        updated = queryset.mark_replied()
+        self.message_user(request, ngettext(
+            '%d message was marked as replied.', '%d messages were marked as replied.', updated,
+        ) % updated, messages.SUCCESS)
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ['recipient', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status']
+    search_fields = ['recipient', 'subject']
+    readonly_fields = ['contact_message', 'subject', 'body', 'from_email', 'recipient', 'attempts', 'last_error', 'created_at', 'sent_at']
+    ordering = ['-created_at']
+    list_select_related = ['contact_message']
+
 # Customize the admin site header
 admin.site.site_header = "Mahendra Dhakal Portfolio Admin"
 admin.site.site_title = "Portfolio Admin"
@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save
 
 
 class AppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app'
+
+    def ready(self):
+        from portfolio.db import configure_connection
+        connection_created.connect(configure_connection, dispatch_uid='configure_connection')
+
+        from .images import IMAGE_FIELDS, image_saved
+        for model in IMAGE_FIELDS:
+            post_save.connect(image_saved, sender=model, dispatch_uid=f'image_saved_{model._meta.label_lower}')
@@ -0,0 +1,62 @@
+"""Logos shown on the skill flipcards.
+
+Skills listed here get a devicon logo; any other skill shows its
+``icon`` emoji, or DEFAULT_SKILL_ICON when that is blank.
+
+``manage.py build_icon_sprite`` copies the logos into one SVG sprite,
+ICON_SPRITE, whose symbols are inlined into the page so the cards need
+no image requests. Logos missing from it still load from the CDN.
+"""
+import functools
+import os
+import posixpath
+import re
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.utils.text import slugify
+
+DEVICON_URL = 'https://cdn.jsdelivr.net/gh/devicons/devicon/icons/{}.svg'
+
+SKILL_LOGOS = {
+    'Django': DEVICON_URL.format('django/django-plain'),
+    'PostgreSQL': DEVICON_URL.format('postgresql/postgresql-original'),
+    'Redis': DEVICON_URL.format('redis/redis-original'),
+    'Docker': DEVICON_URL.format('docker/docker-original'),
+    'AWS': DEVICON_URL.format('amazonwebservices/amazonwebservices-original'),
+    'Nginx': DEVICON_URL.format('nginx/nginx-original'),
+    'Git/GitHub': DEVICON_URL.format('github/github-original'),
+}
+
+DEFAULT_SKILL_ICON = '💻'
+
+SYMBOL_RE = re.compile(r'<symbol\b[^>]*\bid="([^"]+)".*?</symbol>', re.S)
+
+
+def sprite_symbol_id(url):
+    """Symbol id of a logo URL inside the sprite, e.g. icon-django-plain"""
+    stem = posixpath.splitext(posixpath.basename(urlparse(url).path))[0]
+    return f'icon-{slugify(stem)}'
+
+
+def load_sprite():
+    """Map symbol id -> <symbol> markup from the built ICON_SPRITE; empty until it is built"""
+    path = finders.find(settings.ICON_SPRITE)
+    if not path:
+        return {}
+    return parse_sprite(path, os.stat(path).st_mtime_ns)
+
+
+def sprite_version():
+    """Changes whenever the sprite is rebuilt; part of the skill card cache key"""
+    path = finders.find(settings.ICON_SPRITE)
+    return os.stat(path).st_mtime_ns if path else 0
+
+
+@functools.lru_cache(maxsize=4)
+def parse_sprite(path, mtime):
+    """Parsed once per version of the file; ``mtime`` is only part of the cache key"""
+    with open(path, encoding='utf-8') as f:
+        sprite = f.read()
+    return {match.group(1): match.group(0) for match in SYMBOL_RE.finditer(sprite)}
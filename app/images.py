@@ -0,0 +1,150 @@
+"""Resized copies of uploaded images for srcset.
+
+Each uploaded image gets derivatives at IMAGE_DERIVATIVE_WIDTHS in every
+IMAGE_DERIVATIVE_FORMATS format Pillow can encode here, stored under
+derivatives/ in the default storage:
+
+    projects/shot.png -> derivatives/projects/shot-640w.webp
+
+They are written when a model saves an image (see image_saved), or on
+first render for images uploaded before this existed, and can be rebuilt
+with ``manage.py build_image_derivatives``.
+"""
+import io
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, features
+
+from .models import Project, Experience
+
+# Models -> their ImageField that gets derivatives
+IMAGE_FIELDS = {
+    Project: 'image',
+    Experience: 'company_logo',
+}
+
+MIME_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+}
+
+EXTENSIONS = {'jpeg': 'jpg'}
+
+
+def available_formats(has_alpha=False):
+    """IMAGE_DERIVATIVE_FORMATS that this Pillow build can write, in preference order"""
+    formats = []
+    for fmt in settings.IMAGE_DERIVATIVE_FORMATS:
+        if fmt == 'jpeg' and has_alpha:
+            # JPEG would flatten transparent logos onto black
+            fmt = 'png'
+        if fmt in ('avif', 'webp') and not features.check(fmt):
+            continue
+        formats.append(fmt)
+    return formats
+
+
+def derivative_widths(source_width):
+    """Configured widths narrower than the source, plus the source width if it is smaller than the widest"""
+    widths = [width for width in settings.IMAGE_DERIVATIVE_WIDTHS if width < source_width]
+    if source_width <= max(settings.IMAGE_DERIVATIVE_WIDTHS):
+        widths.append(source_width)
+    return widths
+
+
+def derivative_name(name, width, fmt):
+    stem = posixpath.splitext(name)[0]
+    return f'derivatives/{stem}-{width}w.{EXTENSIONS.get(fmt, fmt)}'
+
+
+def describe(name):
+    """(width, height, has_alpha) of a stored image; only reads its header"""
+    with default_storage.open(name) as f:
+        image = Image.open(f)
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+        width, height = image.size
+        # EXIF orientations 5-8 are stored a quarter turn from how they display
+        if image.getexif().get(0x0112, 1) > 4:
+            width, height = height, width
+    return width, height, has_alpha
+
+
+def plan_derivatives(name):
+    """Return (width, height, [(derivative width, format, derivative name)]) for an image"""
+    width, height, has_alpha = describe(name)
+    plan = [
+        (derivative_width, fmt, derivative_name(name, derivative_width, fmt))
+        for fmt in available_formats(has_alpha)
+        for derivative_width in derivative_widths(width)
+    ]
+    return width, height, plan
+
+
+def generate_derivatives(name, force=False):
+    """Write the missing derivatives of a stored image; returns how many were written"""
+    _, _, plan = plan_derivatives(name)
+    return write_derivatives(name, plan, force)
+
+
+def write_derivatives(name, plan, force=False):
+    missing = [(width, fmt, target) for width, fmt, target in plan if force or not default_storage.exists(target)]
+    if not missing:
+        return 0
+
+    with default_storage.open(name) as f:
+        source = ImageOps.exif_transpose(Image.open(f))
+        source.load()
+    for width, fmt, target in missing:
+        image = source.copy()
+        # thumbnail() keeps the aspect ratio and never upscales
+        image.thumbnail((width, image.height), Image.LANCZOS)
+        if fmt == 'jpeg' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        buffer = io.BytesIO()
+        image.save(buffer, fmt.upper(), quality=settings.IMAGE_DERIVATIVE_QUALITY.get(fmt, 80), optimize=True)
+        if default_storage.exists(target):
+            default_storage.delete(target)
+        saved = default_storage.save(target, ContentFile(buffer.getvalue()))
+        if saved != target:
+            # A concurrent request wrote the same derivative first
+            default_storage.delete(saved)
+    return len(missing)
+
+
+def image_sources(field_file):
+    """Everything a <picture> needs for ``field_file``, generating missing derivatives.
+
+    Returns None when the file cannot be read as an image.
+    """
+    try:
+        width, height, plan = plan_derivatives(field_file.name)
+        write_derivatives(field_file.name, plan)
+    except OSError:
+        return None
+
+    srcsets = {}
+    for derivative_width, fmt, target in plan:
+        srcsets.setdefault(fmt, []).append(f'{default_storage.url(target)} {derivative_width}w')
+    *preferred, fallback = srcsets
+    return {
+        'sources': [(MIME_TYPES[fmt], ', '.join(srcsets[fmt])) for fmt in preferred],
+        'srcset': ', '.join(srcsets[fallback]),
+        # The widest fallback, for browsers that ignore srcset
+        'src': srcsets[fallback][-1].rsplit(' ', 1)[0],
+        'width': width,
+        'height': height,
+    }
+
+
+def image_saved(sender, instance, **kwargs):
+    """post_save: build the new image's derivatives once the row is committed"""
+    field_file = getattr(instance, IMAGE_FIELDS[sender])
+    if field_file:
+        name = field_file.name
+        transaction.on_commit(lambda: generate_derivatives(name))
@@ -0,0 +1,90 @@
+import os
+import re
+from urllib.parse import urlparse
+from urllib.request import urlopen
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from app.icons import SKILL_LOGOS, sprite_symbol_id
+from blog.cache import bump_content_version
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+XLINK_NS = 'http://www.w3.org/1999/xlink'
+
+ElementTree.register_namespace('', SVG_NS)
+ElementTree.register_namespace('xlink', XLINK_NS)
+
+
+class Command(BaseCommand):
+    help = 'Collect the skill logos into one SVG sprite served from static files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source-dir', help='Read <name>.svg files from this directory instead of downloading them')
+        parser.add_argument('--output', help='Sprite to write (defaults to ICON_SPRITE in the first STATICFILES_DIRS entry)')
+
+    def handle(self, *args, **options):
+        output = options['output'] or os.path.join(settings.STATICFILES_DIRS[0], settings.ICON_SPRITE)
+        urls = sorted(set(SKILL_LOGOS.values()))
+        self.stdout.write(f'==> Building {output} from {len(urls)} logos...')
+
+        symbols = []
+        for url in urls:
+            symbol_id = sprite_symbol_id(url)
+            try:
+                svg = self.read(url, options['source_dir'])
+                symbols.append(to_symbol(svg, symbol_id))
+            except (OSError, ElementTree.ParseError) as e:
+                self.stderr.write(f'[-] {url}: {e}')
+                continue
+            self.stdout.write(f'[+] {symbol_id}')
+        if not symbols:
+            raise CommandError('No logos could be read')
+
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(f'<svg xmlns="{SVG_NS}" xmlns:xlink="{XLINK_NS}">\n')
+            f.write('\n'.join(symbols))
+            f.write('\n</svg>\n')
+        # Home pages are keyed on sprite_version(), so every process picks up
+        # the new file; the bump also drops entries in a shared cache now
+        bump_content_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'==> Wrote {len(symbols)} symbols ({os.path.getsize(output)} bytes); run collectstatic to fingerprint it'
+        ))
+
+    def read(self, url, source_dir):
+        if source_dir:
+            with open(os.path.join(source_dir, os.path.basename(urlparse(url).path)), encoding='utf-8') as f:
+                return f.read()
+        with urlopen(url, timeout=10) as response:
+            return response.read().decode('utf-8')
+
+
+def to_symbol(svg, symbol_id):
+    """Turn a standalone SVG document into a <symbol>, prefixing its internal ids"""
+    root = ElementTree.fromstring(svg)
+    view_box = root.get('viewBox')
+    if not view_box:
+        width, height = (re.sub(r'[^\d.]', '', root.get(name, '0')) for name in ('width', 'height'))
+        view_box = f'0 0 {width} {height}'
+
+    # Several logos may define the same gradient or clip-path ids
+    ids = {element.get('id') for element in root.iter() if element.get('id')}
+
+    def prefix(match):
+        return f'#{symbol_id}-{match.group(1)}' if match.group(1) in ids else match.group(0)
+
+    for element in root.iter():
+        for name, value in element.items():
+            if name == 'id':
+                element.set(name, f'{symbol_id}-{value}')
+            elif '#' in value:
+                element.set(name, re.sub(r'#([\w.:-]+)', prefix, value))
+
+    symbol = ElementTree.Element(f'{{{SVG_NS}}}symbol', {'id': symbol_id, 'viewBox': view_box})
+    symbol.extend(list(root))
+    markup = ElementTree.tostring(symbol, encoding='unicode')
+    # The sprite's root declares the namespaces once
+    return markup.replace(f' xmlns="{SVG_NS}"', '').replace(f' xmlns:xlink="{XLINK_NS}"', '')
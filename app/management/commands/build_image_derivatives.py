@@ -0,0 +1,46 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from app.images import IMAGE_FIELDS, generate_derivatives
+from portfolio.pool import process_pool
+
+
+def build(name, force):
+    """Runs inside pool workers; errors are reported instead of aborting the run"""
+    try:
+        return name, generate_derivatives(name, force), None
+    except OSError as e:
+        return name, 0, str(e)
+
+
+class Command(BaseCommand):
+    help = 'Generate the resized srcset variants of every uploaded project image and company logo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes')
+        parser.add_argument('--force', action='store_true', help='Rebuild variants that already exist')
+
+    def handle(self, *args, **options):
+        names = set()
+        for model, field in IMAGE_FIELDS.items():
+            names.update(model.objects.exclude(**{field: ''}).values_list(field, flat=True))
+        names = sorted(names)
+        self.stdout.write(f'==> Building derivatives of {len(names)} images with {options["jobs"]} workers...')
+
+        started = time.perf_counter()
+        written = failed = 0
+        with process_pool(max(1, options['jobs'])) as pool:
+            for name, count, error in pool.map(build, names, [options['force']] * len(names)):
+                if error:
+                    failed += 1
+                    self.stderr.write(f'[-] {name}: {error}')
+                elif count:
+                    written += count
+                    self.stdout.write(f'[+] {name}: {count} variants')
+
+        summary = f'==> Wrote {written} variants in {time.perf_counter() - started:.2f}s'
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{summary}; {failed} images could not be read'))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
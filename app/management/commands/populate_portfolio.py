@@ -1,122 +1,146 @@
-from django.core.management.base import BaseCommand
-from app.models import Skill, Project
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+from app.models import Skill, Project, Achievement, Experience
+from blog.cache import POSTS_VERSION_KEY, SKILLS_VERSION_KEY, bump_content_version
+from blog.models import BlogPost
+from blog.snapshot import rebuild_snapshot
+
+DEFAULT_DATA_FILE = Path(__file__).resolve().parents[2] / 'data' / 'portfolio.json'
+
+# Fixture section -> (model, natural key, many-to-many field linking to skills).
+# Rows are upserted on a seed_key derived from the natural key, so content
+# added in the admin is never matched or constrained by it.
+SECTIONS = {
+    'skills': (Skill, ['name'], None),
+    'projects': (Project, ['title'], 'technologies'),
+    'achievements': (Achievement, ['title', 'organization'], None),
+    'experiences': (Experience, ['company', 'position', 'start_date'], 'technologies_used'),
+    'posts': (BlogPost, ['title'], None),
+}
 
 class Command(BaseCommand):
-    help = 'Populate the database with initial portfolio data'
-                                
+    help = 'Populate the database with portfolio data from a JSON or YAML file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('data_file', nargs='?', default=str(DEFAULT_DATA_FILE), help='JSON or YAML file (defaults to app/data/portfolio.json)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT statement')
+
     def handle(self, *args, **options):
-        self.stdout.write('==> Populating portfolio database...')
-        
-        # Create Skills
-        skills_data = [
-            # Programming Languages
-            {'name': 'Python', 'category': 'programming', 'proficiency': 90, 'icon': '🐍', 'description': 'Advanced proficiency in Python for web development, automation, and data processing', 'order': 1},
-            {'name': 'JavaScript', 'category': 'programming', 'proficiency': 80, 'icon': '⚡', 'description': 'Proficient in vanilla JavaScript and modern ES6+ features for interactive experiences', 'order': 4},
-            {'name': 'HTML/CSS', 'category': 'programming', 'proficiency': 95, 'icon': '🎨', 'description': 'Expert in modern HTML5 and CSS3, including responsive design and animations', 'order': 3},
-            
-            # Frameworks & Libraries
-            {'name': 'Django', 'category': 'framework', 'proficiency': 85, 'icon': '🎯', 'description': 'Skilled in Django framework for building robust, scalable web applications', 'order': 2},
-            {'name': 'FastAPI', 'category': 'framework', 'proficiency': 75, 'icon': '⚡', 'description': 'Modern, fast web framework for building APIs with Python 3.7+ based on standard Python type hints', 'order': 8},
-            {'name': 'LangChain', 'category': 'ai_ml', 'proficiency': 70, 'icon': '🔗', 'description': 'Framework for developing applications powered by language models and AI agents', 'order': 10},
-            {'name': 'LangGraph', 'category': 'ai_ml', 'proficiency': 65, 'icon': '📊', 'description': 'Building stateful, multi-actor applications with LLMs using graph-based workflows', 'order': 11},
-            {'name': 'LangSmith', 'category': 'ai_ml', 'proficiency': 68, 'icon': '🔍', 'description': 'Debugging, testing, and monitoring for LLM applications', 'order': 12},
-            
-            # Databases
-            {'name': 'PostgreSQL', 'category': 'database', 'proficiency': 75, 'icon': '🐘', 'description': 'Database design and management with PostgreSQL for robust data solutions', 'order': 5},
-            {'name': 'Redis', 'category': 'database', 'proficiency': 70, 'icon': '🔴', 'description': 'In-memory data structure store for caching, session management, and real-time applications', 'order': 9},
-            
-            # DevOps & Cloud
-            {'name': 'Docker', 'category': 'devops', 'proficiency': 80, 'icon': '🐳', 'description': 'Containerization and deployment using Docker for scalable, portable applications', 'order': 7},
-            {'name': 'AWS', 'category': 'devops', 'proficiency': 72, 'icon': '☁️', 'description': 'Amazon Web Services for cloud hosting, storage, and serverless computing', 'order': 13},
-            {'name': 'Nginx', 'category': 'devops', 'proficiency': 75, 'icon': '🌐', 'description': 'Web server and reverse proxy for high-performance web applications', 'order': 14},
-            
-            # Tools & Technologies
-            {'name': 'Git/GitHub', 'category': 'tools', 'proficiency': 88, 'icon': '📚', 'description': 'Version control expertise for collaborative development and project management', 'order': 6},
-            {'name': 'Postman', 'category': 'tools', 'proficiency': 85, 'icon': '📮', 'description': 'API development and testing tool for building and testing REST APIs', 'order': 15},
-            {'name': 'Celery', 'category': 'tools', 'proficiency': 73, 'icon': '🌿', 'description': 'Distributed task queue for Python applications with asynchronous processing', 'order': 16},
-        ]
-        
-        for skill_data in skills_data:
-            skill, created = Skill.objects.get_or_create(
-                name=skill_data['name'],
-                defaults=skill_data
-            )
-            if created:
-                self.stdout.write(f'[+] Created skill: {skill.name}')
-            else:
-                self.stdout.write(f'[*] Updated skill: {skill.name}')
-                # Update existing skill with new data
-                for key, value in skill_data.items():
-                    setattr(skill, key, value)
-                skill.save()
-        
-        # Create Sample Projects
-        projects_data = [
-            {
-                'title': 'Notes App',
-                'subtitle': 'Full-Featured Note-Taking Application',
-                'short_description': 'A comprehensive web application built with Django and PostgreSQL, featuring user authentication, CRUD operations, and responsive design.',
-                'description': '''
-                A full-featured web application that demonstrates proficiency in backend development, database management, and user experience design.
-                
-                Key Features:
-                - User authentication and authorization system
-                - Complete CRUD operations for notes
-                - Responsive design that works across all devices
-                - Secure user account management
-                - Clean and intuitive user interface
-                
-                Technical Implementation:
-                - Built with Django framework for robust backend
-                - PostgreSQL database for reliable data storage
-                - Bootstrap for responsive frontend styling
-                - Security best practices implemented
-                ''',
-                'github_url': 'https://github.com/mahendra-dhakal/Notes',
-                'tech_tags': 'Django, PostgreSQL, Bootstrap, Python, HTML/CSS',
-                'status': 'completed',
-                'is_featured': True,
-                'order': 1
-            },
-            {
-                'title': 'Portfolio Website',
-                'subtitle': 'Cutting-Edge 2025 Design Portfolio',
-                'short_description': 'This very website! Built with cutting-edge 2025 design principles, featuring advanced CSS animations, glassmorphism effects, and immersive user experiences.',
-                'description': '''
-                A showcase of modern web development techniques and attention to detail, representing the pinnacle of 2025 design trends.
-                
-                Design Features:
-                - Holographic gradients with electric cyan, neon pink, and violet accents
-                - Glassmorphism navigation with backdrop blur effects
-                - Dynamic particle system with animated floating particles
-                - 3D transforms and perspective effects throughout
-                - Custom magnetic cursor with trailing effects
-                
-                Technical Features:
-                - Django backend with dynamic content management
-                - Advanced CSS with custom properties for dynamic theming
-                - Intersection Observer API for performance-optimized animations
-                - Responsive design with mobile-first approach
-                - WCAG 2.1 AA accessibility compliance
-                - SEO-optimized with semantic HTML
-                ''',
-                'tech_tags': 'Django, Advanced CSS, JavaScript, Responsive Design, Animation',
-                'status': 'completed',
-                'is_featured': True,
-                'order': 2
-            }
-        ]
-        
-        for project_data in projects_data:
-            project, created = Project.objects.get_or_create(
-                title=project_data['title'],
-                defaults=project_data
-            )
-            if created:
-                self.stdout.write(f'[+] Created project: {project.title}')
-            else:
-                self.stdout.write(f'[*] Updated project: {project.title}')
-        
+        self.stdout.write(f'==> Populating portfolio database from {options["data_file"]}...')
+        data = self.load(options['data_file'])
+        unknown = set(data) - set(SECTIONS)
+        if unknown:
+            raise CommandError(f'Unknown sections: {", ".join(sorted(unknown))}')
+
+        started = time.perf_counter()
+        # Bulk writes skip post_save, so rebuild the home page snapshot and
+        # invalidate the cached pages once at the end
+        with transaction.atomic():
+            for section, (model, unique_fields, m2m_field) in SECTIONS.items():
+                rows = data.get(section) or []
+                if not rows:
+                    continue
+                section_started = time.perf_counter()
+                pks = self.upsert(model, unique_fields, rows, m2m_field, options['batch_size'])
+                summary = f'{len(rows)} rows'
+                if m2m_field:
+                    links = self.link_skills(model, m2m_field, rows, pks, options['batch_size'])
+                    summary += f', {links} skill links'
+                self.stdout.write(f'[+] {section}: {summary} in {time.perf_counter() - section_started:.2f}s')
+            rebuild_snapshot()
+            transaction.on_commit(bump_content_version)
+            transaction.on_commit(lambda: bump_content_version(SKILLS_VERSION_KEY))
+            transaction.on_commit(lambda: bump_content_version(POSTS_VERSION_KEY))
+
         self.stdout.write(
-            self.style.SUCCESS('==> Successfully populated portfolio database!')
-        )
\ No newline at end of file
+            self.style.SUCCESS(f'==> Successfully populated portfolio database in {time.perf_counter() - started:.2f}s!')
+        )
+
+    def load(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                if path.endswith(('.yaml', '.yml')):
+                    try:
+                        import yaml
+                    except ImportError:
+                        raise CommandError('Install PyYAML to load YAML data files')
+                    return yaml.safe_load(f) or {}
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read {path}: {e}')
+
+    def upsert(self, model, unique_fields, rows, m2m_field, batch_size):
+        """Insert or update ``rows`` on their seed key; returns their pks in order"""
+        objects = {}
+        keys = []
+        fields = set()
+        for row in rows:
+            values = {key: value for key, value in row.items() if key != m2m_field}
+            try:
+                fields.update(model._meta.get_field(key).attname for key in values)
+            except FieldDoesNotExist as e:
+                raise CommandError(f'{model.__name__}: {e}')
+            obj = model(**values)
+            if model is BlogPost:
+                # save() is skipped, so build the stored excerpt and HTML here
+                obj.render_content()
+                fields.update(['excerpt', 'content_html'])
+            # One statement cannot upsert the same key twice; the last row wins
+            obj.seed_key = seed_key(obj, unique_fields)
+            keys.append(obj.seed_key)
+            objects[obj.seed_key] = obj
+
+        # created_* keeps its original value on update; updated_* is refreshed
+        update_fields = [
+            field.name for field in model._meta.concrete_fields
+            if (field.attname in fields or getattr(field, 'auto_now', False))
+            and field.name != 'seed_key' and not field.primary_key
+        ]
+        model.objects.bulk_create(
+            list(objects.values()), batch_size=batch_size,
+            update_conflicts=True, unique_fields=['seed_key'], update_fields=update_fields,
+        )
+
+        # Look the pks up by seed key; not every backend returns them for updated rows
+        ids = {}
+        seeded = model.objects.filter(seed_key__isnull=False).values_list('pk', 'seed_key')
+        for pk, key in seeded.iterator(chunk_size=batch_size):
+            if key in objects:
+                ids[key] = pk
+        return [ids[key] for key in keys]
+
+    def link_skills(self, model, m2m_field, rows, pks, batch_size):
+        """Replace the skill links of every row that lists them; returns the link count"""
+        through = getattr(model, m2m_field).through
+        owner_column = f'{model._meta.model_name}_id'
+        # Names are only unique among seeded skills; those win over admin-added namesakes
+        skills = Skill.objects.order_by(F('seed_key').asc(nulls_first=True), 'pk')
+        skill_ids = dict(skills.values_list('name', 'pk'))
+        linked = {}
+        for row, pk in zip(rows, pks):
+            if m2m_field not in row:
+                continue
+            missing = [name for name in row[m2m_field] if name not in skill_ids]
+            if missing:
+                raise CommandError(f'{model.__name__} {pk}: unknown skills {", ".join(missing)}')
+            linked[pk] = {skill_ids[name] for name in row[m2m_field]}
+
+        through.objects.filter(**{f'{owner_column}__in': list(linked)}).delete()
+        through.objects.bulk_create([
+            through(**{owner_column: pk, 'skill_id': skill_id})
+            for pk, skills in linked.items() for skill_id in skills
+        ], batch_size=batch_size)
+        return sum(len(skills) for skills in linked.values())
+
+
+def seed_key(obj, unique_fields):
+    # Migrations app.0005 and blog.0005 backfill existing rows with a copy of this
+    values = [str(getattr(obj, field)) for field in unique_fields]
+    return hashlib.sha1(json.dumps(values).encode()).hexdigest()
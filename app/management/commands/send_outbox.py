@@ -0,0 +1,96 @@
+import time
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from app.models import OutboundEmail
+
+class Command(BaseCommand):
+    help = 'Deliver queued contact form emails over a single reused SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the due emails once and exit instead of polling')
+        parser.add_argument('--batch-size', type=int, default=50, help='Emails claimed and sent per batch')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--max-attempts', type=int, default=5, help='Give up on an email after this many failures')
+        parser.add_argument('--backoff', type=int, default=60, help='Base retry delay in seconds, doubled after each failure')
+        parser.add_argument('--lease', type=int, default=300, help='Seconds a claimed email is hidden from other workers')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.stdout.write('==> Sending outbox...')
+        connection = get_connection()
+        try:
+            while True:
+                emails = self.claim_batch()
+                if emails:
+                    self.send_batch(connection, emails)
+                elif options['once']:
+                    break
+                else:
+                    # Nothing due; release the SMTP connection while idle
+                    connection.close()
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+        self.stdout.write(self.style.SUCCESS('==> Outbox drained!'))
+
+    def claim_batch(self):
+        """Lease the next due emails so concurrent workers skip them"""
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                OutboundEmail.objects.select_for_update(skip_locked=True)
+                .filter(status='pending', next_attempt_at__lte=now)
+                .order_by('next_attempt_at')[:self.options['batch_size']]
+            )
+            if emails:
+                OutboundEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+                    next_attempt_at=now + timedelta(seconds=self.options['lease'])
+                )
+        return emails
+
+    def send_batch(self, connection, emails):
+        started = time.monotonic()
+        sent = []
+        failed = []
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=[email.recipient],
+                connection=connection,
+            )
+            try:
+                # An explicitly opened connection stays open across messages
+                connection.open()
+                connection.send_messages([message])
+            except Exception as e:
+                # Drop a possibly broken connection; the next message reconnects
+                connection.close()
+                self.record_failure(email, e)
+                failed.append(email)
+            else:
+                sent.append(email.pk)
+
+        if sent:
+            OutboundEmail.objects.filter(pk__in=sent).update(status='sent', sent_at=timezone.now(), last_error='')
+        for email in failed:
+            email.save(update_fields=['status', 'attempts', 'next_attempt_at', 'last_error'])
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(f'[+] Sent {len(sent)}, failed {len(failed)} in {elapsed:.2f}s')
+
+    def record_failure(self, email, error):
+        email.attempts += 1
+        email.last_error = f'{type(error).__name__}: {error}'
+        if email.attempts >= self.options['max_attempts']:
+            email.status = 'failed'
+        else:
+            delay = self.options['backoff'] * 2 ** (email.attempts - 1)
+            email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_contactmessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=400)),
+                ('body', models.TextField()),
+                ('from_email', models.EmailField(max_length=254)),
+                ('recipient', models.EmailField(max_length=254)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Not sent before this time')),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('contact_message', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbound_emails', to='app.contactmessage')),
+            ],
+            options={
+                'verbose_name': 'Outbound Email',
+                'verbose_name_plural': 'Outbound Emails',
+                'ordering': ['next_attempt_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx')],
+            },
+        ),
+    ]
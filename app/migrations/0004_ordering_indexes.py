@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_outboundemail'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='achievement',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['order', '-date_achieved'], name='achievement_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-created_at'], name='contact_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['order', '-start_date'], name='experience_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['order', '-created_at'], name='project_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['order', '-created_at'], name='project_featured_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['order', 'name'], name='skill_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['order', 'name'], name='skill_featured_order_idx'),
+        ),
+    ]
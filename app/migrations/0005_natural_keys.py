@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:48
+
+import hashlib
+import json
+from collections import Counter
+
+from django.db import migrations, models
+
+# Natural key of each model's rows in the populate_portfolio data file
+NATURAL_KEYS = {
+    'skill': ['name'],
+    'project': ['title'],
+    'achievement': ['title', 'organization'],
+    'experience': ['company', 'position', 'start_date'],
+}
+
+
+def seed_key(values):
+    # A frozen copy of populate_portfolio.seed_key
+    return hashlib.sha1(json.dumps([str(value) for value in values]).encode()).hexdigest()
+
+
+def backfill_seed_keys(model, fields):
+    """Key existing rows so a later populate_portfolio updates them instead of adding copies.
+
+    Rows sharing a natural key are left unkeyed rather than merged; they are
+    ordinary content, and populate_portfolio then inserts its own row.
+    """
+    keys = {row[0]: seed_key(row[1:]) for row in model.objects.values_list('pk', *fields)}
+    counts = Counter(keys.values())
+    keyed = [model(pk=pk, seed_key=key) for pk, key in keys.items() if counts[key] == 1]
+    model.objects.bulk_update(keyed, ['seed_key'], batch_size=500)
+
+
+def backfill(apps, schema_editor):
+    for model_name, fields in NATURAL_KEYS.items():
+        backfill_seed_keys(apps.get_model('app', model_name), fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='achievement',
+            name='seed_key',
+            field=models.CharField(blank=True, editable=False, help_text='Set by populate_portfolio on the rows it loads and upserts on; empty for rows added in the admin', max_length=40, null=True),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='seed_key',
+            field=models.CharField(blank=True, editable=False, help_text='Set by populate_portfolio on the rows it loads and upserts on; empty for rows added in the admin', max_length=40, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='seed_key',
+            field=models.CharField(blank=True, editable=False, help_text='Set by populate_portfolio on the rows it loads and upserts on; empty for rows added in the admin', max_length=40, null=True),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='seed_key',
+            field=models.CharField(blank=True, editable=False, help_text='Set by populate_portfolio on the rows it loads and upserts on; empty for rows added in the admin', max_length=40, null=True),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='achievement',
+            constraint=models.UniqueConstraint(fields=('seed_key',), name='achievement_seed_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='experience',
+            constraint=models.UniqueConstraint(fields=('seed_key',), name='experience_seed_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.UniqueConstraint(fields=('seed_key',), name='project_seed_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='skill',
+            constraint=models.UniqueConstraint(fields=('seed_key',), name='skill_seed_key'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:12
+
+from django.db import migrations, models
+
+# External-content FTS5 table for the admin's contact message search, kept in
+# sync by triggers like the ones in blog.0004
+TABLE = 'app_contactmessage'
+COLUMNS = ('name', 'email', 'subject', 'message')
+
+
+def index_sql(table, columns):
+    fts = f'{table}_fts'
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{c}' for c in columns)
+    old = ', '.join(f'old.{c}' for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 is SQLite only; other databases fall back to icontains search
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in index_sql(TABLE, COLUMNS):
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for suffix in ('ai', 'ad', 'au'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {TABLE}_fts_{suffix}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {TABLE}_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_natural_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['-created_at'], name='contact_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(condition=models.Q(('is_replied', False)), fields=['-created_at'], name='contact_unreplied_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,6 +1,10 @@
 from django.db import models
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from .icons import DEFAULT_SKILL_ICON, SKILL_LOGOS
+
 class Skill(models.Model):
     CATEGORY_CHOICES = [
         ('programming', 'Programming Languages'),
@@ -24,12 +28,29 @@ class Skill(models.Model):
     order = models.PositiveIntegerField(default=0, help_text="Order of display (lower numbers first)")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    seed_key = models.CharField(max_length=40, null=True, blank=True, editable=False, help_text="Set by populate_portfolio on the rows it loads and upserts on; empty for rows added in the admin")
     
     class Meta:
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(fields=['order', 'name'], name='skill_order_idx'),
+            models.Index(fields=['order', 'name'], name='skill_featured_order_idx', condition=models.Q(is_featured=True)),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['seed_key'], name='skill_seed_key'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.proficiency}%)"
+    
+    @property
+    def logo_url(self):
+        """Devicon image for well-known skills, if there is one"""
+        return SKILL_LOGOS.get(self.name)
+    
+    @property
+    def display_icon(self):
+        return self.icon or DEFAULT_SKILL_ICON
 
 class Project(models.Model):
     STATUS_CHOICES = [
@@ -73,19 +94,38 @@ class Project(models.Model):
     completion_date = models.DateField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    seed_key = models.CharField(max_length=40, null=True, blank=True, editable=False, help_text="Set by populate_portfolio on the rows it loads and upserts on; empty for rows added in the admin")
     
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['order', '-created_at'], name='project_order_idx'),
+            models.Index(fields=['order', '-created_at'], name='project_featured_order_idx', condition=models.Q(is_featured=True)),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['seed_key'], name='project_seed_key'),
+        ]
     
     def __str__(self):
         return self.title
     
     def get_tech_list(self):
-        """Get list of technologies, prioritizing ManyToMany relationship"""
-        if self.technologies.exists():
-            return [skill.name for skill in self.technologies.all()]
-        elif self.tech_tags:
-            return [tag.strip() for tag in self.tech_tags.split(',')]
+        """Get list of technologies, prioritizing ManyToMany relationship.
+
+        Uses the prefetched technologies when the queryset was built with
+        prefetch_related('technologies'), so listing pages stay at a fixed
+        number of queries.
+        """
+        technologies = [skill.name for skill in self.technologies.all()]
+        if technologies:
+            return technologies
+        return self.tech_tag_list
+    
+    @cached_property
+    def tech_tag_list(self):
+        """Parsed tech_tags, computed once per instance"""
+        if self.tech_tags:
+            return [tag.strip() for tag in self.tech_tags.split(',') if tag.strip()]
         return []
     
     def get_features_list(self):
@@ -123,9 +163,16 @@ class Achievement(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    seed_key = models.CharField(max_length=40, null=True, blank=True, editable=False, help_text="Set by populate_portfolio on the rows it loads and upserts on; empty for rows added in the admin")
     
     class Meta:
         ordering = ['order', '-date_achieved']
+        indexes = [
+            models.Index(fields=['order', '-date_achieved'], name='achievement_featured_idx', condition=models.Q(is_featured=True)),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['seed_key'], name='achievement_seed_key'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.organization}"
@@ -163,9 +210,16 @@ class Experience(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    seed_key = models.CharField(max_length=40, null=True, blank=True, editable=False, help_text="Set by populate_portfolio on the rows it loads and upserts on; empty for rows added in the admin")
     
     class Meta:
         ordering = ['order', '-start_date']
+        indexes = [
+            models.Index(fields=['order', '-start_date'], name='experience_featured_idx', condition=models.Q(is_featured=True)),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['seed_key'], name='experience_seed_key'),
+        ]
     
     def __str__(self):
         return f"{self.position} at {self.company}"
@@ -174,6 +228,21 @@ class Experience(models.Model):
     def is_current(self):
         return self.end_date is None
 
+class ContactMessageQuerySet(models.QuerySet):
+    """Status transitions as single conditional UPDATEs.
+
+    Only the flag column is written, and only on rows still in the old
+    state, so a concurrent edit of the same message is neither overwritten
+    nor counted twice. Each returns the number of rows it changed.
+    """
+
+    def mark_read(self):
+        return self.filter(is_read=False).update(is_read=True)
+
+    def mark_replied(self):
+        return self.filter(is_replied=False).update(is_replied=True)
+
+
 class ContactMessage(models.Model):
     name = models.CharField(max_length=200, help_text="Full name of the person")
     email = models.EmailField(help_text="Email address for response")
@@ -193,8 +262,18 @@ class ContactMessage(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
     
+    objects = ContactMessageQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='contact_created_idx'),
+            # The admin's unread / unreplied filters, newest first. Partial
+            # because is_read=False compiles to NOT "is_read", which a
+            # plain index on the column cannot seek on
+            models.Index(fields=['-created_at'], condition=models.Q(is_read=False), name='contact_unread_idx'),
+            models.Index(fields=['-created_at'], condition=models.Q(is_replied=False), name='contact_unreplied_idx'),
+        ]
         verbose_name = "Contact Message"
         verbose_name_plural = "Contact Messages"
     
@@ -202,9 +281,47 @@ class ContactMessage(models.Model):
         return f"{self.name} - {self.subject[:50]}"
     
     def mark_as_read(self):
+        """Mark this message read; False if it already was, e.g. by another request"""
+        changed = ContactMessage.objects.filter(pk=self.pk).mark_read()
         self.is_read = True
-        self.save()
+        return bool(changed)
     
     def mark_as_replied(self):
+        """Mark this message replied; False if it already was"""
+        changed = ContactMessage.objects.filter(pk=self.pk).mark_replied()
         self.is_replied = True
-        self.save()
\ No newline at end of file
+        return bool(changed)
+
+class OutboundEmail(models.Model):
+    """Email queued by the contact form and delivered by the send_outbox command"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    contact_message = models.ForeignKey(ContactMessage, on_delete=models.CASCADE, related_name='outbound_emails')
+    subject = models.CharField(max_length=400)
+    body = models.TextField()
+    from_email = models.EmailField()
+    recipient = models.EmailField()
+    
+    # Delivery state
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="Not sent before this time")
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+    
+    def __str__(self):
+        return f"{self.recipient} - {self.subject[:50]}"
@@ -0,0 +1,29 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from app.images import image_sources
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(field_file, alt, sizes='100vw', **attrs):
+    """Render an uploaded image as a lazy-loading <picture> of its resized derivatives.
+
+    Usage: {% responsive_image project.image project.title sizes="50vw" style="..." %}
+    Extra keyword arguments become attributes of the <img>.
+    """
+    extra = format_html_join('', ' {}="{}"', sorted(attrs.items()))
+    sources = image_sources(field_file)
+    if sources is None:
+        # Unreadable or missing file: link the original as before
+        return format_html('<img src="{}" alt="{}" loading="lazy"{}>', field_file.url, alt, extra)
+
+    source_tags = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((mime_type, srcset, sizes) for mime_type, srcset in sources['sources']),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" loading="lazy" decoding="async"{}></picture>',
+        source_tags, sources['src'], sources['srcset'], sizes, sources['width'], sources['height'], alt, extra,
+    )
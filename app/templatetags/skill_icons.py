@@ -0,0 +1,35 @@
+from django import template
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from app.icons import load_sprite, sprite_symbol_id
+
+register = template.Library()
+
+
+@register.simple_tag
+def skill_logo(skill):
+    """A skill's logo as a reference into the inline sprite, a CDN image, or its emoji"""
+    url = skill.logo_url
+    if not url:
+        return skill.display_icon
+    symbol_id = sprite_symbol_id(url)
+    if symbol_id in load_sprite():
+        return format_html('<svg class="skill-icon" role="img" aria-label="{}"><use href="#{}"></use></svg>', skill.name, symbol_id)
+    # Not in the sprite yet (run build_icon_sprite)
+    return format_html('<img src="{}" alt="{}" loading="lazy" />', url, skill.name)
+
+
+@register.simple_tag
+def icon_sprite(skills):
+    """Inline the sprite symbols that ``skills`` use, for skill_logo's <use> references"""
+    sprite = load_sprite()
+    symbol_ids = {sprite_symbol_id(skill.logo_url) for skill in skills if skill.logo_url}
+    symbols = [sprite[symbol_id] for symbol_id in sorted(symbol_ids) if symbol_id in sprite]
+    if not symbols:
+        return ''
+    # Hidden by size rather than display: none, which breaks gradients inside symbols
+    return mark_safe(
+        '<svg xmlns="http://www.w3.org/2000/svg" width="0" height="0" style="position: absolute" aria-hidden="true">'
+        + ''.join(symbols) + '</svg>'
+    )
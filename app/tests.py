@@ -1,3 +1,527 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache, caches
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from PIL import Image
+
+from blog.models import BlogPost
+from blog.pagination import encode_cursor, seek
+from .admin import ContactMessageAdmin
+from .images import derivative_name
+from .models import Skill, Project, Achievement, Experience, ContactMessage, OutboundEmail
+
+
+class ProjectTechListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.django = Skill.objects.create(name='Django', category='framework', proficiency=85, description='Web framework')
+        self.postgres = Skill.objects.create(name='PostgreSQL', category='database', proficiency=75, description='Database')
+
+    def create_projects(self, count):
+        start = Project.objects.count()
+        for i in range(start, start + count):
+            project = Project.objects.create(
+                title=f'Project {i}',
+                description='Description',
+                short_description='Short description',
+                tech_tags='Python, HTML/CSS',
+            )
+            if i % 2:
+                project.technologies.add(self.django, self.postgres)
+
+    def count_home_queries(self):
+        # Measure a first visit, which skips the conditional GET validators
+        self.client.cookies.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('index'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_get_tech_list_prefers_technologies(self):
+        self.create_projects(2)
+        with_skills = Project.objects.get(title='Project 1')
+        without_skills = Project.objects.get(title='Project 0')
+        self.assertEqual(sorted(with_skills.get_tech_list()), ['Django', 'PostgreSQL'])
+        self.assertEqual(without_skills.get_tech_list(), ['Python', 'HTML/CSS'])
+
+    def test_get_tech_list_uses_prefetched_technologies(self):
+        self.create_projects(4)
+        projects = list(Project.objects.prefetch_related('technologies'))
+        with self.assertNumQueries(0):
+            for project in projects:
+                project.get_tech_list()
+
+    def test_home_query_count_is_independent_of_project_count(self):
+        self.create_projects(2)
+        small = self.count_home_queries()
+        self.create_projects(198)
+        large = self.count_home_queries()
+        self.assertEqual(small, large)
+
+
+class HomeFragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.django = Skill.objects.create(name='Django', category='framework', proficiency=85, description='Web framework')
+        self.project = Project.objects.create(title='Portfolio', description='D', short_description='S')
+
+    def test_skill_logo_comes_from_lookup_then_icon(self):
+        Skill.objects.create(name='Python', category='programming', proficiency=90, description='D', icon='🐍')
+        Skill.objects.create(name='Fortran', category='programming', proficiency=10, description='D')
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, 'devicon/icons/django/django-plain.svg" alt="Django"')
+        self.assertContains(response, '🐍')
+        self.assertContains(response, '💻')
+
+    def test_unchanged_cards_are_reused(self):
+        self.client.get(reverse('index'))
+        # update() leaves updated_at alone, so the cached card still applies
+        Project.objects.filter(pk=self.project.pk).update(title='Renamed')
+        BlogPost.objects.create(title='New post', content='Body', author='Mahendra')
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, 'New post')
+        self.assertContains(response, 'Portfolio')
+        self.assertNotContains(response, 'Renamed')
+
+    def test_technology_changes_refresh_project_card(self):
+        self.client.get(reverse('index'))
+        # add() runs in its own transaction; the snapshot is rebuilt on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.technologies.add(self.django)
+        self.assertContains(self.client.get(reverse('index')), '<span class="tech-tag">Django</span>')
+
+        self.django.name = 'Django 5'
+        self.django.save()
+        self.assertContains(self.client.get(reverse('index')), '<span class="tech-tag">Django 5</span>')
+
+
+class IconSpriteTests(TestCase):
+    DJANGO_SVG = (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="128" height="128">'
+        '<linearGradient id="a"><stop offset="0" stop-color="#092e20"/></linearGradient>'
+        '<path fill="url(#a)" d="M0 0h128v128H0z"/></svg>'
+    )
+
+    def setUp(self):
+        cache.clear()
+        Skill.objects.create(name='Django', category='framework', proficiency=85, description='Web framework')
+        self.static_dir = tempfile.mkdtemp()
+        self.source_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_dir)
+        self.addCleanup(shutil.rmtree, self.source_dir)
+        with open(os.path.join(self.source_dir, 'django-plain.svg'), 'w') as f:
+            f.write(self.DJANGO_SVG)
+
+    def test_cards_switch_from_cdn_to_inline_sprite(self):
+        with override_settings(STATICFILES_DIRS=[self.static_dir]):
+            self.assertContains(self.client.get(reverse('index')), 'django-plain.svg" alt="Django" loading="lazy"')
+
+            stderr = StringIO()
+            call_command('build_icon_sprite', source_dir=self.source_dir, stdout=StringIO(), stderr=stderr)
+            self.assertIn('redis-original.svg', stderr.getvalue())
+
+            response = self.client.get(reverse('index'))
+        self.assertContains(response, '<use href="#icon-django-plain"></use>')
+        self.assertContains(response, '<symbol id="icon-django-plain" viewBox="0 0 128 128">', count=1)
+        self.assertContains(response, '<linearGradient id="icon-django-plain-a">')
+        self.assertContains(response, 'fill="url(#icon-django-plain-a)"')
+        self.assertNotContains(response, 'cdn.jsdelivr.net')
+
+    def test_rebuild_reaches_processes_that_missed_the_bump(self):
+        with override_settings(STATICFILES_DIRS=[self.static_dir]):
+            self.client.get(reverse('index'))
+            etag = self.client.get(reverse('index'))['ETag']
+            # As if the command ran in another process with its own LocMemCache
+            with mock.patch('app.management.commands.build_icon_sprite.bump_content_version'):
+                call_command('build_icon_sprite', source_dir=self.source_dir, stdout=StringIO(), stderr=StringIO())
+
+            response = self.client.get(reverse('index'), headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<use href="#icon-django-plain"></use>')
+
+    def test_no_readable_logos_is_an_error(self):
+        with self.assertRaises(CommandError):
+            call_command('build_icon_sprite', source_dir=tempfile.gettempdir(), output=os.path.join(self.static_dir, 'x.svg'),
+                         stdout=StringIO(), stderr=StringIO())
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, IMAGE_DERIVATIVE_WIDTHS=[320, 640], IMAGE_DERIVATIVE_FORMATS=['webp', 'jpeg'],
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload(self, size=(1000, 500), mode='RGB', image_format='PNG'):
+        buffer = BytesIO()
+        Image.new(mode, size, 'teal').save(buffer, image_format)
+        return SimpleUploadedFile('shot.png', buffer.getvalue())
+
+    def test_saving_an_image_writes_derivatives(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(title='Shot', description='D', short_description='S', image=self.upload())
+        for width in (320, 640):
+            with default_storage.open(derivative_name(project.image.name, width, 'webp')) as f:
+                self.assertEqual(Image.open(f).size, (width, width // 2))
+            self.assertTrue(default_storage.exists(derivative_name(project.image.name, width, 'jpeg')))
+
+    def test_home_page_renders_lazy_srcset(self):
+        # Created without running on_commit, so the first render builds them
+        project = Project.objects.create(title='Shot', description='D', short_description='S', image=self.upload())
+        response = self.client.get(reverse('index'))
+        webp_320 = default_storage.url(derivative_name(project.image.name, 320, 'webp'))
+        self.assertContains(response, f'<source type="image/webp" srcset="{webp_320} 320w')
+        self.assertContains(response, 'width="1000" height="500" alt="Shot" loading="lazy"')
+        self.assertTrue(default_storage.exists(derivative_name(project.image.name, 640, 'jpeg')))
+
+    def test_small_transparent_logo_keeps_its_size_and_alpha(self):
+        experience = Experience.objects.create(
+            company='Acme', position='Engineer', description='D', start_date='2024-01-01',
+            company_logo=self.upload(size=(200, 100), mode='RGBA'),
+        )
+        call_command('build_image_derivatives', jobs=1, stdout=StringIO())
+        self.assertFalse(default_storage.exists(derivative_name(experience.company_logo.name, 320, 'webp')))
+        with default_storage.open(derivative_name(experience.company_logo.name, 200, 'png')) as f:
+            self.assertEqual(Image.open(f).mode, 'RGBA')
+
+    def test_command_builds_in_parallel(self):
+        projects = [
+            Project.objects.create(title=f'Shot {i}', description='D', short_description='S', image=self.upload())
+            for i in range(3)
+        ]
+        out = StringIO()
+        call_command('build_image_derivatives', jobs=2, stdout=out)
+        self.assertIn('==> Wrote 12 variants', out.getvalue())
+        for project in projects:
+            self.assertTrue(default_storage.exists(derivative_name(project.image.name, 640, 'webp')))
+
+
+class FailingEmailBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP unavailable')
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        caches['ratelimit'].clear()
+
+    def submit_contact_form(self):
+        return self.client.post(reverse('index'), {
+            'name': 'Visitor',
+            'email': 'visitor@example.com',
+            'subject': 'Hello',
+            'message': 'I would like to talk about a project.',
+        })
+
+    def test_contact_form_queues_emails_without_sending(self):
+        response = self.submit_contact_form()
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 0)
+        contact_message = ContactMessage.objects.get()
+        self.assertEqual(contact_message.outbound_emails.filter(status='pending').count(), 2)
+
+    def test_worker_sends_queued_emails(self):
+        self.submit_contact_form()
+        call_command('send_outbox', once=True, stdout=StringIO())
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ['mahendradhakal700@gmail.com', 'visitor@example.com'])
+        self.assertEqual(OutboundEmail.objects.filter(status='sent').count(), 2)
+
+    @override_settings(EMAIL_BACKEND='app.tests.FailingEmailBackend')
+    def test_failed_sends_back_off_and_give_up(self):
+        self.submit_contact_form()
+        call_command('send_outbox', once=True, max_attempts=2, stdout=StringIO())
+        email = OutboundEmail.objects.first()
+        self.assertEqual((email.status, email.attempts), ('pending', 1))
+        self.assertIn('SMTP unavailable', email.last_error)
+
+        OutboundEmail.objects.update(next_attempt_at=email.created_at)
+        call_command('send_outbox', once=True, max_attempts=2, stdout=StringIO())
+        self.assertEqual(OutboundEmail.objects.filter(status='failed', attempts=2).count(), 2)
+
+
+class PopulatePortfolioTests(TestCase):
+    def write_data(self, data, suffix='.json'):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w') as f:
+            f.write(json.dumps(data))
+        return path
+
+    def populate(self, path):
+        call_command('populate_portfolio', path, stdout=StringIO())
+
+    def test_default_data_file_is_idempotent(self):
+        call_command('populate_portfolio', stdout=StringIO())
+        ids = list(Skill.objects.values_list('id', flat=True))
+        call_command('populate_portfolio', stdout=StringIO())
+        self.assertEqual(list(Skill.objects.values_list('id', flat=True)), ids)
+        self.assertTrue(Project.objects.filter(title='Notes App').exists())
+
+    def test_upsert_updates_rows_and_replaces_links(self):
+        data = {
+            'skills': [
+                {'name': 'Django', 'category': 'framework', 'proficiency': 80, 'description': 'Web'},
+                {'name': 'Redis', 'category': 'database', 'proficiency': 70, 'description': 'Cache'},
+            ],
+            'projects': [{'title': 'Shop', 'description': 'D', 'short_description': 'S', 'technologies': ['Django', 'Redis']}],
+            'posts': [{'title': 'Hello', 'content': 'First post', 'author': 'Mahendra'}],
+        }
+        self.populate(self.write_data(data))
+        data['skills'][0]['proficiency'] = 95
+        data['projects'][0]['technologies'] = ['Redis']
+        data['posts'][0]['content'] = 'Edited post'
+        self.populate(self.write_data(data))
+
+        self.assertEqual(Skill.objects.get(name='Django').proficiency, 95)
+        self.assertEqual(Project.objects.get().get_tech_list(), ['Redis'])
+        post = BlogPost.objects.get()
+        self.assertEqual(post.content_html, '<p>Edited post</p>')
+
+    def test_admin_rows_may_share_seeded_titles(self):
+        Skill.objects.create(name='Django', category='framework', proficiency=10, description='Admin copy')
+        BlogPost.objects.create(title='Hello', content='Admin post', author='Editor')
+        BlogPost.objects.create(title='Hello', content='Another admin post', author='Editor')
+        data = {
+            'skills': [{'name': 'Django', 'category': 'framework', 'proficiency': 80, 'description': 'Web'}],
+            'projects': [{'title': 'Shop', 'description': 'D', 'short_description': 'S', 'technologies': ['Django']}],
+            'posts': [{'title': 'Hello', 'content': 'Seeded post', 'author': 'Mahendra'}],
+        }
+        self.populate(self.write_data(data))
+        self.populate(self.write_data(data))
+
+        self.assertEqual(BlogPost.objects.filter(title='Hello').count(), 3)
+        self.assertEqual(BlogPost.objects.filter(seed_key__isnull=True).count(), 2)
+        seeded = Skill.objects.get(name='Django', seed_key__isnull=False)
+        self.assertEqual(seeded.proficiency, 80)
+        self.assertEqual(list(Project.objects.get().technologies.all()), [seeded])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def data(count):
+            return {
+                'skills': [{'name': f'Skill {i}', 'category': 'tools', 'proficiency': 50, 'description': 'D'} for i in range(count)],
+                'projects': [
+                    {'title': f'Project {i}', 'description': 'D', 'short_description': 'S', 'technologies': [f'Skill {i}']}
+                    for i in range(count)
+                ],
+            }
+
+        # 40 projects still fit in one INSERT under SQLite's 999-parameter limit
+        small, large = self.write_data(data(2)), self.write_data(data(40))
+        with CaptureQueriesContext(connection) as small_ctx:
+            self.populate(small)
+        with CaptureQueriesContext(connection) as large_ctx:
+            self.populate(large)
+        self.assertEqual(len(small_ctx.captured_queries), len(large_ctx.captured_queries))
+        self.assertEqual(Project.technologies.through.objects.count(), 40)
+
+    def test_loads_yaml(self):
+        path = self.write_data({'skills': [{'name': 'Go', 'category': 'programming', 'proficiency': 40, 'description': 'D'}]}, '.yaml')
+        self.populate(path)
+        self.assertTrue(Skill.objects.filter(name='Go').exists())
+
+    def test_unknown_skill_is_an_error(self):
+        path = self.write_data({'projects': [{'title': 'X', 'description': 'D', 'short_description': 'S', 'technologies': ['Nope']}]})
+        with self.assertRaises(CommandError):
+            self.populate(path)
+        self.assertFalse(Project.objects.exists())
+
+
+class SkillsDetailTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Skill.objects.create(name='Docker', category='devops', proficiency=80, description='Containers', order=2)
+        Skill.objects.create(name='Python', category='programming', proficiency=90, description='Language', order=1)
+        Skill.objects.create(name='Django', category='framework', proficiency=85, description='Framework', order=3)
+
+    def test_skills_grouped_in_category_order_with_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('skills'))
+        grouped = response.context['skills_by_category']
+        self.assertEqual(list(grouped), ['Programming Languages', 'Frameworks & Libraries', 'DevOps & Cloud'])
+        self.assertEqual([skill.name for skill in grouped['DevOps & Cloud']], ['Docker'])
+
+    def test_grouping_is_cached_until_a_skill_changes(self):
+        self.client.get(reverse('skills'))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('skills'))
+        Skill.objects.create(name='Redis', category='database', proficiency=70, description='Cache')
+        self.assertContains(self.client.get(reverse('skills')), 'Redis')
+
+
+class ContactMessageStatusTests(TestCase):
+    def setUp(self):
+        self.message = ContactMessage.objects.create(name='Ada', email='ada@example.com', subject='Hello', message='Hi')
+
+    def test_transition_writes_only_the_flag(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(self.message.mark_as_read())
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"message"', queries[0]['sql'])
+        self.assertTrue(ContactMessage.objects.get().is_read)
+
+    def test_transition_happens_once(self):
+        self.assertTrue(self.message.mark_as_replied())
+        self.assertFalse(self.message.mark_as_replied())
+        self.assertTrue(self.message.is_replied)
+
+    def test_stale_instance_keeps_concurrent_edits(self):
+        ContactMessage.objects.filter(pk=self.message.pk).update(subject='Edited', is_replied=True)
+        self.message.mark_as_read()
+        message = ContactMessage.objects.get()
+        self.assertEqual((message.subject, message.is_read, message.is_replied), ('Edited', True, True))
+
+    def test_bulk_transition_counts_changed_rows(self):
+        ContactMessage.objects.create(name='Bob', email='bob@example.com', subject='Hey', message='Yo', is_read=True)
+        self.assertEqual(ContactMessage.objects.mark_read(), 1)
+        self.assertEqual(ContactMessage.objects.mark_read(), 0)
+
+
+class ContactMessageAdminTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.url = reverse('admin:app_contactmessage_changelist')
+        ContactMessage.objects.bulk_create([
+            ContactMessage(name=f'Sender {i}', email=f'sender{i}@example.com', subject='Hello', message='Hi there')
+            for i in range(5)
+        ])
+        ContactMessage.objects.create(name='Ada', email='ada@example.com', subject='Consulting', message='Query planners')
+
+    def changelist(self, **params):
+        return self.client.get(self.url, params)
+
+    def run_action(self, action):
+        ids = ContactMessage.objects.values_list('pk', flat=True)[:3]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {
+                'action': action, '_selected_action': [str(pk) for pk in ids],
+            })
+        self.assertEqual(response.status_code, 302)
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "app_contactmessage"')]
+        self.assertEqual(len(updates), 1)
+
+    def test_mark_read_is_one_update(self):
+        self.run_action('mark_read')
+        self.assertEqual(ContactMessage.objects.filter(is_read=True).count(), 3)
+
+    def test_mark_replied_is_one_update(self):
+        self.run_action('mark_replied')
+        self.assertEqual(ContactMessage.objects.filter(is_replied=True).count(), 3)
+
+    def test_no_full_count_or_date_hierarchy(self):
+        response = self.changelist()
+        self.assertIsNone(response.context['cl'].date_hierarchy)
+        self.assertFalse(response.context['cl'].show_full_result_count)
+
+    @skipUnless(connection.vendor == 'sqlite', 'Full-text index is SQLite only')
+    def test_search_uses_index(self):
+        response = self.changelist(q='planner')
+        self.assertEqual([m.name for m in response.context['cl'].result_list], ['Ada'])
+
+    @skipUnless(connection.vendor == 'sqlite', 'Estimate reads the SQLite rowid')
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=3)
+    def test_unfiltered_count_is_estimated(self):
+        ContactMessage.objects.filter(name='Sender 0').delete()
+        self.assertEqual(ContactMessage.objects.count(), 5)
+        # The largest rowid still counts the deleted row...
+        self.assertEqual(self.changelist().context['cl'].result_count, 6)
+        # ...but filtered lists are counted exactly
+        self.assertEqual(self.changelist(is_read__exact='0').context['cl'].result_count, 5)
+
+    @skipUnless(connection.vendor == 'sqlite', 'Estimate reads the SQLite rowid')
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=3)
+    def test_pages_past_the_real_end_are_empty(self):
+        ContactMessage.objects.filter(name__in=['Sender 0', 'Sender 1', 'Sender 2']).delete()
+        with mock.patch.object(ContactMessageAdmin, 'list_per_page', 2):
+            # Estimated 6 rows on 3 pages; only 3 rows (2 pages) are left
+            response = self.changelist(p=3)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(list(response.context['cl'].result_list), [])
+            self.assertEqual(len(self.changelist(p=2).context['cl'].result_list), 1)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=3)
+    def test_pages_past_a_low_estimate_still_render(self):
+        # PostgreSQL's reltuples can lag behind inserts
+        with mock.patch.object(ContactMessageAdmin, 'list_per_page', 2), \
+                mock.patch('portfolio.paginator.estimate_count', return_value=4):
+            response = self.changelist(p=3)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['cl'].result_list), 2)
+
+    @skipUnless(connection.vendor == 'sqlite', 'Estimate reads the SQLite rowid')
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=3)
+    def test_deleted_tail_lowers_the_estimate(self):
+        newest = ContactMessage.objects.order_by('-pk')[:2]
+        ContactMessage.objects.filter(pk__in=list(newest.values_list('pk', flat=True))).delete()
+        with mock.patch.object(ContactMessageAdmin, 'list_per_page', 2):
+            response = self.changelist(p=2)
+            self.assertEqual(response.context['cl'].result_count, 4)
+            self.assertEqual(len(response.context['cl'].result_list), 2)
+            self.assertEqual(list(self.changelist(p=3).context['cl'].result_list), [])
+
+    def test_small_tables_are_counted_exactly(self):
+        ContactMessage.objects.filter(name='Sender 0').delete()
+        self.assertEqual(self.changelist().context['cl'].result_count, 5)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite syntax')
+class QueryPlanTests(TestCase):
+    """The list queries must walk an index in order instead of sorting"""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index_name}', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_home_page_queries_use_partial_indexes(self):
+        self.assertUsesIndex(Skill.objects.filter(is_featured=True), 'skill_featured_order_idx')
+        self.assertUsesIndex(Project.objects.filter(is_featured=True), 'project_featured_order_idx')
+        self.assertUsesIndex(Achievement.objects.filter(is_featured=True)[:3], 'achievement_featured_idx')
+        self.assertUsesIndex(Experience.objects.filter(is_featured=True)[:2], 'experience_featured_idx')
+        self.assertUsesIndex(BlogPost.objects.order_by('-created_on')[:3], 'blog_created_id_idx')
+
+    def test_full_listings_use_ordering_indexes(self):
+        self.assertUsesIndex(Skill.objects.all(), 'skill_order_idx')
+        self.assertUsesIndex(Project.objects.all(), 'project_order_idx')
+        self.assertUsesIndex(ContactMessage.objects.all(), 'contact_created_idx')
+        self.assertUsesIndex(BlogPost.objects.order_by('-created_on', '-id')[:11], 'blog_created_id_idx')
+
+    def test_archive_seek_searches_the_index(self):
+        post = BlogPost.objects.create(title='Cursor', content='Body', author='Mahendra')
+        plan = seek(BlogPost.objects.all(), encode_cursor(post))[:11].explain()
+        self.assertIn('SEARCH', plan)
+        self.assertNotIn('SCAN', plan)
+        self.assertIn('USING INDEX blog_created_id_idx', plan)
+
+    def test_admin_filters_use_indexes(self):
+        self.assertUsesIndex(ContactMessage.objects.filter(is_read=False), 'contact_unread_idx')
+        self.assertUsesIndex(ContactMessage.objects.filter(is_replied=False), 'contact_unreplied_idx')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite connection tuning')
+class SQLitePragmaTests(TestCase):
+    def test_pragmas_are_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA temp_store')
+            self.assertEqual(cursor.fetchone()[0], 2)  # MEMORY
@@ -1,10 +1,13 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import render
+from blog.cache import SKILLS_VERSION_KEY, versioned_key
 from .models import Skill, Project, Achievement, Experience
 
 def home(request):
     # Get featured content for the home page
     skills = Skill.objects.filter(is_featured=True)
-    projects = Project.objects.filter(is_featured=True)
+    projects = Project.objects.filter(is_featured=True).prefetch_related('technologies')
     achievements = Achievement.objects.filter(is_featured=True)[:3]  # Show top 3
     experiences = Experience.objects.filter(is_featured=True)[:2]  # Show recent 2
     
@@ -24,13 +27,12 @@ def home(request):
 
 def skills_detail(request):
     """Detailed skills page showing all skills organized by category"""
-    skills_by_category = {}
-    categories = Skill.CATEGORY_CHOICES
-    
-    for category_key, category_name in categories:
-        skills = Skill.objects.filter(category=category_key)
-        if skills.exists():
-            skills_by_category[category_name] = skills
+    # The grouping only changes when a Skill does
+    cache_key = versioned_key('skills-by-category', SKILLS_VERSION_KEY)
+    skills_by_category = cache.get(cache_key)
+    if skills_by_category is None:
+        skills_by_category = group_skills_by_category(Skill.objects.all())
+        cache.set(cache_key, skills_by_category, settings.PAGE_CACHE_TIMEOUT)
     
     context = {
         'skills_by_category': skills_by_category,
@@ -38,13 +40,26 @@ def skills_detail(request):
     
     return render(request, 'skills_detail.html', context)
 
+def group_skills_by_category(skills):
+    """Group skills by category name, in CATEGORY_CHOICES order, with one query"""
+    grouped = {category_key: [] for category_key, _ in Skill.CATEGORY_CHOICES}
+    for skill in skills:
+        grouped.setdefault(skill.category, []).append(skill)
+    
+    category_names = dict(Skill.CATEGORY_CHOICES)
+    return {
+        category_names.get(category_key, category_key): category_skills
+        for category_key, category_skills in grouped.items()
+        if category_skills
+    }
+
 def projects_detail(request):
     """Detailed projects page showing all projects"""
-    projects = Project.objects.all()
+    projects = list(Project.objects.prefetch_related('technologies'))
     
-    # Group projects by status if needed
-    completed_projects = projects.filter(status='completed')
-    in_progress_projects = projects.filter(status='in_progress')
+    # Group projects by status in Python so the prefetched technologies are reused
+    completed_projects = [project for project in projects if project.status == 'completed']
+    in_progress_projects = [project for project in projects if project.status == 'in_progress']
     
     context = {
         'projects': projects,
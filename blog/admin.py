@@ -1,7 +1,16 @@
 from django.contrib import admin
+from portfolio.paginator import EstimatedCountPaginator
 from .models import BlogPost
+from .search import SearchIndexAdminMixin
 
 @admin.register(BlogPost)
-class BlogPostAdmin(admin.ModelAdmin):
+class BlogPostAdmin(SearchIndexAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'author', 'created_on')
+    # title from the full-text index on SQLite, author (not indexed) with icontains
     search_fields = ('title', 'author')
+    search_index_kind = 'post'
+    # Served by blog_created_id_idx; the pk keeps pages stable on equal dates
+    ordering = ('-created_on', '-id')
+    # No COUNT(*) over the whole table on every page
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
+
+    def ready(self):
+        from .signals import connect_signals, search_triggers_migrated, snapshot_migrated
+        connect_signals()
+        post_migrate.connect(snapshot_migrated, sender=self, dispatch_uid='snapshot_migrated')
+        post_migrate.connect(search_triggers_migrated, sender=self, dispatch_uid='search_triggers_migrated')
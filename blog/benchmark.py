@@ -0,0 +1,23 @@
+"""Helpers shared by the benchmark management commands."""
+import math
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(latencies, elapsed):
+    """Requests/sec and latency percentiles (in milliseconds) for one run"""
+    return {
+        'requests': len(latencies),
+        'requests_per_sec': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p90_ms': round(percentile(latencies, 90) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'max_ms': round(max(latencies, default=0) * 1000, 2),
+    }
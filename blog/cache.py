@@ -0,0 +1,47 @@
+"""Versioned cache keys for rendered portfolio content.
+
+Every cached page is stored under a key that embeds the current content
+version. Editing any portfolio model bumps the version (see signals.py),
+so stale entries are never read again and simply expire.
+"""
+import time
+
+from django.core.cache import cache
+
+CONTENT_VERSION_KEY = 'portfolio:content-version'
+# Bumped only when a Skill changes, for entries that depend on skills alone
+SKILLS_VERSION_KEY = 'portfolio:skills-version'
+# Bumped only when a BlogPost changes, for the sitemap and feed
+POSTS_VERSION_KEY = 'portfolio:posts-version'
+
+
+def get_content_version(version_key=CONTENT_VERSION_KEY):
+    """Return the current content version, initialising it if needed"""
+    version = cache.get(version_key)
+    if version is None:
+        # Seed from the clock so an evicted version never reuses old keys
+        cache.add(version_key, time.time_ns(), timeout=None)
+        version = cache.get(version_key)
+    return version
+
+
+def bump_content_version(version_key=CONTENT_VERSION_KEY):
+    """Invalidate every cache entry built on ``version_key``"""
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, time.time_ns(), timeout=None)
+
+
+def versioned_key(name, version_key=CONTENT_VERSION_KEY):
+    """Build a cache key that changes whenever the versioned content changes"""
+    return f'portfolio:{name}:v{get_content_version(version_key)}'
+
+
+async def aversioned_key(name):
+    """Async version of versioned_key()"""
+    version = await cache.aget(CONTENT_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CONTENT_VERSION_KEY, time.time_ns(), timeout=None)
+        version = await cache.aget(CONTENT_VERSION_KEY)
+    return f'portfolio:{name}:v{version}'
@@ -0,0 +1,148 @@
+"""Conditional GET (ETag / Last-Modified) for the public pages.
+
+Validators come from the newest timestamp and row count of the tables a
+page shows, gathered in one UNION ALL query and cached under the content
+version. A client whose validator still matches gets a 304 before the
+view runs any of its own queries.
+"""
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db.models import CharField, Count, Max, Value
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from app.icons import sprite_version
+from app.models import Skill, Project, Achievement, Experience
+from .cache import versioned_key
+from .models import BlogPost
+
+
+def table_stats(querysets):
+    """(newest timestamp, row count) of every queryset, in a single query"""
+    selects = []
+    for label, (queryset, timestamp_field) in enumerate(querysets):
+        # Grouping on a constant aggregates the whole table into one row
+        selects.append(
+            queryset.order_by()
+            .annotate(label=Value(str(label), output_field=CharField()))
+            .values('label')
+            .annotate(latest=Max(timestamp_field), count=Count('pk'))
+            .values_list('label', 'latest', 'count')
+        )
+    rows = selects[0].union(*selects[1:], all=True) if len(selects) > 1 else selects[0]
+    stats = {label: (latest, count) for label, latest, count in rows}
+    return [stats.get(str(label), (None, 0)) for label in range(len(querysets))]
+
+
+def compute_validators(querysets):
+    """Return (etag, last_modified), or (None, None) when every table is empty"""
+    stats = table_stats(querysets)
+    if not any(count for _, count in stats):
+        return None, None
+    last_modified = max(latest for latest, _ in stats if latest is not None)
+    digest = hashlib.sha1(repr([(latest.isoformat() if latest else '', count) for latest, count in stats]).encode())
+    return digest.hexdigest(), last_modified
+
+
+def get_validators(name, querysets):
+    """compute_validators(), cached until portfolio content changes"""
+    key = versioned_key(f'validators:{name}')
+    validators = cache.get(key)
+    if validators is None:
+        validators = compute_validators(querysets)
+        cache.set(key, validators, settings.PAGE_CACHE_TIMEOUT)
+    return validators
+
+
+def home_validators(request):
+    etag, last_modified = get_validators('home', [
+        (Skill.objects.all(), 'updated_at'),
+        (Project.objects.all(), 'updated_at'),
+        (Achievement.objects.all(), 'updated_at'),
+        (Experience.objects.all(), 'updated_at'),
+        (BlogPost.objects.all(), 'updated_on'),
+    ])
+    if etag is None:
+        return None, None
+    # Rebuilding the icon sprite changes the page without touching any table
+    return hashlib.sha1(f'{etag}:{sprite_version()}'.encode()).hexdigest(), last_modified
+
+
+def blog_list_validators(request):
+    etag, _ = get_validators('blog-list', [(BlogPost.objects.all(), 'updated_on')])
+    # Deleting any post but the newest leaves max(updated_on) as it was, so
+    # If-Modified-Since would keep the deleted post listed; the ETag has the
+    # row count and catches it
+    return etag, None
+
+
+def blog_detail_validators(request, post_id):
+    # No rows means a 404, which the view itself renders
+    return get_validators(f'blog-detail:{post_id}', [(BlogPost.objects.filter(id=post_id), 'updated_on')])
+
+
+def conditional_view(validators_func, per_visitor=False):
+    """Return 304 Not Modified when the client's validators are current.
+
+    ``validators_func(request, *args, **kwargs)`` returns (etag, last_modified).
+    With ``per_visitor``, the page embeds the visitor's CSRF token and flash
+    messages: the CSRF cookie is mixed into the ETag, Last-Modified is not
+    sent, and requests without the cookie or with pending messages always
+    get a full render.
+    """
+    def prepare(request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if per_visitor:
+            cookies = request.COOKIES
+            return settings.CSRF_COOKIE_NAME in cookies and CookieStorage.cookie_name not in cookies
+        return True
+
+    def build(request, validators):
+        etag, last_modified = validators
+        if etag is None:
+            return None, None
+        if per_visitor:
+            csrf_cookie = request.COOKIES[settings.CSRF_COOKIE_NAME]
+            etag = hashlib.sha1(f'{etag}:{csrf_cookie}'.encode()).hexdigest()
+            last_modified = None
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return f'W/"{etag}"', timestamp
+
+    def finish(request, response, etag, timestamp):
+        if etag and response.status_code == 200:
+            response.headers.setdefault('ETag', etag)
+            if timestamp:
+                response.headers.setdefault('Last-Modified', http_date(timestamp))
+        return response
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def inner(request, *args, **kwargs):
+                if not prepare(request):
+                    return await view_func(request, *args, **kwargs)
+                validators = await sync_to_async(validators_func)(request, *args, **kwargs)
+                etag, timestamp = build(request, validators)
+                response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return finish(request, response, etag, timestamp)
+        else:
+            @wraps(view_func)
+            def inner(request, *args, **kwargs):
+                if not prepare(request):
+                    return view_func(request, *args, **kwargs)
+                etag, timestamp = build(request, validators_func(request, *args, **kwargs))
+                response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+                if response is None:
+                    response = view_func(request, *args, **kwargs)
+                return finish(request, response, etag, timestamp)
+        return inner
+    return decorator
@@ -0,0 +1,165 @@
+"""sitemap.xml and the blog RSS feed, streamed from the database.
+
+Rows are read with QuerySet.iterator() over just the columns each entry
+needs and written out as they arrive, so memory stays flat however many
+posts there are. The rendered output is cached under the posts version
+(see cache.py): the sitemap chunk by chunk, each chunk remembering the pk
+it ended on, so a partly evicted sitemap resumes the query after the last
+cached chunk instead of starting over.
+"""
+import math
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.feedgenerator import rfc2822_date
+
+from .cache import POSTS_VERSION_KEY, get_content_version
+from .models import BlogPost
+
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+FEED_TITLE = 'Mahendra Dhakal - Blog'
+FEED_DESCRIPTION = 'Insights and articles on web development, engineering, and technology.'
+# Stand-in argument reversed once and swapped for each row's pk
+URL_SLOT = 987654321
+
+
+def sitemap_index(request):
+    """List the sitemap pages; each holds at most SITEMAP_PAGE_SIZE posts"""
+    key = cache_key(request, 'sitemap-index')
+    body = cache.get(key)
+    if body is None:
+        pages = max(1, math.ceil(BlogPost.objects.count() / settings.SITEMAP_PAGE_SIZE))
+        entries = ''.join(
+            f'<sitemap><loc>{absolute_url(request, "sitemap-page", page)}</loc></sitemap>'
+            for page in range(1, pages + 1)
+        )
+        body = (
+            f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">{entries}</sitemapindex>\n'
+        )
+        cache.set(key, body, settings.PAGE_CACHE_TIMEOUT)
+    return HttpResponse(body, content_type='application/xml')
+
+
+def sitemap_page(request, page):
+    """One page of the sitemap; the first also lists the home page and the blog"""
+    if page < 1:
+        raise Http404('No such sitemap page')
+    posts = BlogPost.objects.order_by('pk').values_list('pk', 'updated_on')
+    post_url = url_maker(request, 'blog_detail')
+
+    def render_post(post):
+        post_id, updated_on = post
+        return f'<url><loc>{post_url(post_id)}</loc><lastmod>{updated_on.isoformat()}</lastmod></url>'
+
+    def stream():
+        yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NAMESPACE}">'
+        if page == 1:
+            yield f'<url><loc>{absolute_url(request, "index")}</loc></url>'
+            yield f'<url><loc>{absolute_url(request, "blog-list")}</loc></url>'
+        yield from cached_chunks(
+            cache_key(request, f'sitemap-{page}'), posts,
+            (page - 1) * settings.SITEMAP_PAGE_SIZE, settings.SITEMAP_PAGE_SIZE, render_post,
+        )
+        yield '</urlset>\n'
+
+    return StreamingHttpResponse(stream(), content_type='application/xml')
+
+
+def blog_feed(request):
+    """RSS 2.0 feed of the latest FEED_SIZE posts"""
+    key = cache_key(request, 'feed')
+    body = cache.get(key)
+    if body is not None:
+        return HttpResponse(body, content_type='application/rss+xml; charset=utf-8')
+
+    posts = BlogPost.objects.only('id', 'title', 'author', 'created_on', 'excerpt').order_by('-created_on', '-id')
+    post_url = url_maker(request, 'blog_detail')
+
+    def stream():
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>'
+            f'<title>{escape(FEED_TITLE)}</title>'
+            f'<link>{absolute_url(request, "blog-list")}</link>'
+            f'<description>{escape(FEED_DESCRIPTION)}</description>'
+        ]
+        yield parts[0]
+        for post in posts[:settings.FEED_SIZE].iterator(chunk_size=settings.FEED_CHUNK_SIZE):
+            url = post_url(post.id)
+            item = (
+                f'<item><title>{escape(post.title)}</title><link>{url}</link>'
+                f'<guid isPermaLink="true">{url}</guid><pubDate>{rfc2822_date(post.created_on)}</pubDate>'
+                f'<dc:creator>{escape(post.author)}</dc:creator><description>{escape(post.excerpt)}</description></item>'
+            )
+            parts.append(item)
+            yield item
+        parts.append('</channel></rss>\n')
+        yield parts[-1]
+        # The feed is bounded by FEED_SIZE, so it is cached whole once complete
+        cache.set(key, ''.join(parts), settings.PAGE_CACHE_TIMEOUT)
+
+    return StreamingHttpResponse(stream(), content_type='application/rss+xml; charset=utf-8')
+
+
+def cached_chunks(key, queryset, offset, limit, render_row):
+    """Yield queryset[offset:offset + limit] rendered in cached chunks of FEED_CHUNK_SIZE rows.
+
+    ``queryset`` must be ordered by pk and yield the pk first in each row.
+    Each chunk is cached as (body, last pk, row count, is last chunk).
+    """
+    chunk_size = settings.FEED_CHUNK_SIZE
+    index = 0
+    emitted = 0
+    last_pk = None
+    while True:
+        cached = cache.get(f'{key}:{index}')
+        if cached is None:
+            break
+        body, last_pk, rows, done = cached
+        yield body
+        if done:
+            return
+        emitted += rows
+        index += 1
+
+    if last_pk is None:
+        rows = queryset[offset:offset + limit]
+    else:
+        rows = queryset.filter(pk__gt=last_pk)[:limit - emitted]
+    rows = rows.iterator(chunk_size=chunk_size)
+    while True:
+        batch = list(islice(rows, chunk_size))
+        done = len(batch) < chunk_size
+        body = ''.join(render_row(row) for row in batch)
+        if batch:
+            last_pk = batch[-1][0]
+        cache.set(f'{key}:{index}', (body, last_pk, len(batch), done), settings.PAGE_CACHE_TIMEOUT)
+        yield body
+        if done:
+            return
+        index += 1
+
+
+def cache_key(request, name):
+    """Versioned on the posts; the host is part of the key as every URL is absolute"""
+    version = get_content_version(POSTS_VERSION_KEY)
+    return f'portfolio:{name}:{request.scheme}://{request.get_host()}:v{version}'
+
+
+def absolute_url(request, view_name, *args):
+    return escape(request.build_absolute_uri(reverse(view_name, args=args)))
+
+
+def url_maker(request, view_name):
+    """Return a function building absolute_url() of a view taking one integer.
+
+    Reversing once per response instead of once per row is most of the
+    cost of rendering a cold sitemap.
+    """
+    head, _, tail = absolute_url(request, view_name, URL_SLOT).rpartition(str(URL_SLOT))
+    return lambda pk: f'{head}{pk}{tail}'
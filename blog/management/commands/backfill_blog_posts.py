@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from blog.models import BlogPost, RENDERED_FIELDS
+
+class Command(BaseCommand):
+    help = 'Recompute the stored excerpt and rendered HTML of blog posts in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Posts loaded and updated per batch')
+        parser.add_argument('--missing-only', action='store_true', help='Only fill posts that have no rendered HTML yet')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = BlogPost.objects.only('id', 'content').order_by('id')
+        if options['missing_only']:
+            queryset = queryset.filter(content_html='')
+
+        self.stdout.write('==> Backfilling blog posts...')
+        updated = 0
+        last_id = 0
+        while True:
+            # Seek on id so each batch is an index range scan
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            for post in batch:
+                post.render_content()
+            with transaction.atomic():
+                BlogPost.objects.bulk_update(batch, RENDERED_FIELDS)
+            updated += len(batch)
+            last_id = batch[-1].id
+            self.stdout.write(f'[*] Updated {updated} posts')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'==> Backfilled {updated} blog posts!')
+        )
@@ -0,0 +1,158 @@
+import json
+import random
+import subprocess
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, setup_databases, setup_test_environment,
+    teardown_databases, teardown_test_environment,
+)
+from django.urls import reverse
+from app.models import Skill, Project, Achievement, Experience
+from blog.benchmark import percentile, summarize
+from blog.models import BlogPost
+from blog.pagination import encode_cursor
+from blog.snapshot import rebuild_snapshot
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic dataset in a throwaway test database and benchmark the public pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skills', type=int, default=30)
+        parser.add_argument('--projects', type=int, default=50)
+        parser.add_argument('--techs-per-project', type=int, default=5, help='Skill links per project')
+        parser.add_argument('--achievements', type=int, default=20)
+        parser.add_argument('--experiences', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per endpoint')
+        parser.add_argument('--cold', action='store_true', help='Clear the cache before every request')
+        parser.add_argument('--json', metavar='PATH', help="Write results as JSON to PATH ('-' for stdout)")
+        parser.add_argument('--keepdb', action='store_true', help='Reuse the test database between runs')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the dataset and request order')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        try:
+            if not options['keepdb'] or not BlogPost.objects.exists():
+                self.seed(options)
+            cache.clear()
+            results = self.run_endpoints(options)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        report = {
+            'commit': self.git_commit(),
+            'dataset': {key: options[key] for key in ('skills', 'projects', 'techs_per_project', 'achievements', 'experiences', 'posts')},
+            'requests': options['requests'],
+            'cold': options['cold'],
+            'endpoints': results,
+        }
+        if options['json'] == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        if options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump(report, f, indent=2)
+        self.print_table(report)
+
+    def seed(self, options):
+        started = time.perf_counter()
+        categories = [key for key, _ in Skill.CATEGORY_CHOICES]
+        skills = Skill.objects.bulk_create([
+            Skill(name=f'Skill {i}', category=categories[i % len(categories)], proficiency=i % 101,
+                  description=f'Experience with skill {i}', order=i)
+            for i in range(options['skills'])
+        ])
+        projects = Project.objects.bulk_create([
+            Project(title=f'Project {i}', subtitle=f'Subtitle {i}', description=self.words(120),
+                    short_description=self.words(30), tech_tags='Python, Django, HTML/CSS',
+                    github_url=f'https://github.com/example/project-{i}', order=i)
+            for i in range(options['projects'])
+        ])
+        links = []
+        for project in projects:
+            for skill in self.random.sample(skills, min(options['techs_per_project'], len(skills))):
+                links.append(Project.technologies.through(project_id=project.id, skill_id=skill.id))
+        Project.technologies.through.objects.bulk_create(links)
+        Achievement.objects.bulk_create([
+            Achievement(title=f'Achievement {i}', category='certification', organization=f'Org {i}',
+                        description=self.words(20), date_achieved=f'2024-01-{i % 28 + 1:02d}', order=i)
+            for i in range(options['achievements'])
+        ])
+        Experience.objects.bulk_create([
+            Experience(company=f'Company {i}', position='Developer', description=self.words(60),
+                       start_date=f'2023-{i % 12 + 1:02d}-01', order=i)
+            for i in range(options['experiences'])
+        ])
+        posts = []
+        for i in range(options['posts']):
+            post = BlogPost(title=f'Post {i}', content='\n\n'.join(self.words(80) for _ in range(8)), author='Bench')
+            post.render_content()
+            posts.append(post)
+        BlogPost.objects.bulk_create(posts, batch_size=500)
+        # bulk_create() sends no signals
+        rebuild_snapshot()
+        self.stderr.write(f'[+] Seeded dataset in {time.perf_counter() - started:.2f}s')
+
+    def words(self, count):
+        vocabulary = ['django', 'query', 'cache', 'index', 'engineer', 'latency', 'design', 'python', 'build', 'structure']
+        return ' '.join(self.random.choice(vocabulary) for _ in range(count))
+
+    def run_endpoints(self, options):
+        post_ids = list(BlogPost.objects.values_list('id', flat=True))
+        # A cursor near the end of the archive, to show deep pages stay cheap
+        oldest = BlogPost.objects.order_by('created_on', 'id')[10:11].first()
+        endpoints = {
+            'home': lambda: reverse('index'),
+            'blog_list': lambda: reverse('blog-list'),
+            'blog_list_deep': lambda: reverse('blog-list') + (f'?cursor={encode_cursor(oldest)}' if oldest else ''),
+            'blog_detail': lambda: reverse('blog_detail', args=[self.random.choice(post_ids)]) if post_ids else reverse('blog-list'),
+        }
+        client = Client()
+        results = {}
+        for name, url in endpoints.items():
+            for _ in range(options['warmup']):
+                client.get(url())
+            latencies, queries, sizes = [], [], []
+            started = time.perf_counter()
+            for _ in range(options['requests']):
+                if options['cold']:
+                    cache.clear()
+                path = url()
+                with CaptureQueriesContext(connection) as ctx:
+                    request_started = time.perf_counter()
+                    response = client.get(path)
+                    latencies.append(time.perf_counter() - request_started)
+                queries.append(len(ctx.captured_queries))
+                sizes.append(len(response.content))
+            stats = summarize(latencies, time.perf_counter() - started)
+            stats.update({
+                'queries_p50': percentile(queries, 50),
+                'queries_max': max(queries),
+                'bytes_avg': round(sum(sizes) / len(sizes)),
+            })
+            results[name] = stats
+        return results
+
+    def git_commit(self):
+        try:
+            return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def print_table(self, report):
+        self.stdout.write(f'==> Benchmark at {report["commit"] or "unknown commit"} ({report["requests"]} requests per endpoint)')
+        self.stdout.write(f'{"endpoint":<16} {"req/s":>9} {"p50 ms":>8} {"p90 ms":>8} {"p99 ms":>8} {"queries":>8} {"bytes":>9}')
+        for name, stats in report['endpoints'].items():
+            self.stdout.write(
+                f'{name:<16} {stats["requests_per_sec"]:>9} {stats["p50_ms"]:>8} {stats["p90_ms"]:>8} '
+                f'{stats["p99_ms"]:>8} {stats["queries_p50"]:>8} {stats["bytes_avg"]:>9}'
+            )
@@ -0,0 +1,144 @@
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from blog.benchmark import summarize
+
+class Command(BaseCommand):
+    help = 'Compare latency of the async views under ASGI with the sync views under WSGI'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=['both', 'wsgi', 'asgi'], default='both', help='Which handler to drive')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per path')
+        parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight at once')
+        parser.add_argument('--path', action='append', dest='paths', help='Path to request (repeatable), defaults to / and /blog/')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/', '/blog/']
+        if options['server'] == 'both':
+            results = {server: self.run_in_subprocess(server, options) for server in ('wsgi', 'asgi')}
+        else:
+            results = {options['server']: self.run(options['server'], paths, options)}
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f'==> {options["requests"]} requests per path, concurrency {options["concurrency"]}')
+        self.stdout.write(f'{"server":<6} {"path":<20} {"req/s":>9} {"p50 ms":>9} {"p99 ms":>9}')
+        for server, by_path in results.items():
+            for path, stats in by_path.items():
+                self.stdout.write(
+                    f'{server:<6} {path:<20} {stats["requests_per_sec"]:>9} {stats["p50_ms"]:>9} {stats["p99_ms"]:>9}'
+                )
+
+    def run_in_subprocess(self, server, options):
+        """Run one handler in a fresh process, since the URLconf picks views at import time"""
+        # Not argv[0], which is not manage.py under call_command() or python -m django
+        env = dict(
+            os.environ, PORTFOLIO_ASYNC_VIEWS='1' if server == 'asgi' else '0',
+            DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE,
+        )
+        command = [
+            sys.executable, '-m', 'django', 'bench_asgi', '--server', server, '--json',
+            '--requests', str(options['requests']), '--concurrency', str(options['concurrency']),
+        ]
+        for path in options['paths'] or []:
+            command += ['--path', path]
+        output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+        return json.loads(output)[server]
+
+    def run(self, server, paths, options):
+        if settings.ASYNC_VIEWS != (server == 'asgi'):
+            raise CommandError(f'Set PORTFOLIO_ASYNC_VIEWS={int(server == "asgi")} to benchmark {server}')
+        results = {}
+        for path in paths:
+            if server == 'asgi':
+                latencies, elapsed = asyncio.run(self.drive_asgi(path, options['requests'], options['concurrency']))
+            else:
+                latencies, elapsed = self.drive_wsgi(path, options['requests'], options['concurrency'])
+            results[path] = summarize(latencies, elapsed)
+        return results
+
+    def drive_wsgi(self, path, total, concurrency):
+        handler = WSGIHandler()
+        path_info, _, query = path.partition('?')
+
+        def request(_):
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': path_info,
+                'QUERY_STRING': query,
+                'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_HOST': 'localhost',
+                'REMOTE_ADDR': '127.0.0.1',
+                'wsgi.input': io.BytesIO(),
+                'wsgi.errors': sys.stderr,
+                'wsgi.url_scheme': 'http',
+            }
+            started = time.perf_counter()
+            body = handler(environ, lambda status, headers, exc_info=None: None)
+            b''.join(body)
+            body.close()
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(request, range(total)))
+        return latencies, time.perf_counter() - started
+
+    async def drive_asgi(self, path, total, concurrency):
+        handler = ASGIHandler()
+        path_info, _, query = path.partition('?')
+        limit = asyncio.Semaphore(concurrency)
+
+        async def request():
+            finished = asyncio.Event()
+            received = False
+
+            async def receive():
+                nonlocal received
+                if not received:
+                    received = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                # Keep the connection open until the response is complete
+                await finished.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.body' and not message.get('more_body'):
+                    finished.set()
+
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path_info,
+                'raw_path': path_info.encode(),
+                'query_string': query.encode(),
+                'headers': [(b'host', b'localhost')],
+                'client': ('127.0.0.1', 50000),
+                'server': ('localhost', 80),
+            }
+            async with limit:
+                started = time.perf_counter()
+                await handler(scope, receive, send)
+                return time.perf_counter() - started
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(request() for _ in range(total)))
+        return list(latencies), time.perf_counter() - started
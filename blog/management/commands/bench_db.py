@@ -0,0 +1,210 @@
+import io
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from blog.benchmark import summarize
+from blog.models import BlogPost
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent contact-form writes mixed with blog reads against the configured database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engine', action='append', dest='engines', choices=['sqlite', 'postgresql'],
+                            help='Database profile to run (repeatable); defaults to the configured one')
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent clients')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per worker')
+        parser.add_argument('--write-ratio', type=float, default=0.2, help='Share of requests that submit the contact form')
+        parser.add_argument('--posts', type=int, default=200, help='Blog posts to seed')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        engines = options['engines'] or [settings.DB_ENGINE]
+        results = {}
+        for engine in engines:
+            if engine == settings.DB_ENGINE:
+                results[engine] = self.run(options)
+            else:
+                results[engine] = self.run_in_subprocess(engine, options)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f'==> {options["workers"]} workers x {options["requests"]} requests, '
+            f'{options["write_ratio"]:.0%} contact-form writes'
+        )
+        self.stdout.write(f'{"engine":<11} {"kind":<6} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8} {"max ms":>8} {"errors":>7}')
+        for engine, result in results.items():
+            for kind in ('read', 'write'):
+                stats = result[kind]
+                self.stdout.write(
+                    f'{engine:<11} {kind:<6} {stats["requests_per_sec"]:>9} {stats["p50_ms"]:>8} '
+                    f'{stats["p99_ms"]:>8} {stats["max_ms"]:>8} {stats["errors"]:>7}'
+                )
+            self.stdout.write(f'{"":<11} {result["profile"]}')
+
+    def run_in_subprocess(self, engine, options):
+        """Settings pick the database at import time, so other profiles need a fresh process"""
+        # Not argv[0], which is not manage.py under call_command() or python -m django
+        env = dict(os.environ, PORTFOLIO_DB_ENGINE=engine, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        command = [
+            sys.executable, '-m', 'django', 'bench_db', '--json',
+            '--workers', str(options['workers']), '--requests', str(options['requests']),
+            '--write-ratio', str(options['write_ratio']), '--posts', str(options['posts']), '--seed', str(options['seed']),
+        ]
+        result = subprocess.run(command, env=env, capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(f'{engine} run failed:\n{result.stderr}')
+        return json.loads(result.stdout)[engine]
+
+    def run(self, options):
+        if connection.vendor == 'sqlite':
+            # The default in-memory test database would hide file locking
+            path = os.path.join(tempfile.gettempdir(), 'portfolio-bench-db.sqlite3')
+            connection.settings_dict['TEST']['NAME'] = path
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            BlogPost.objects.bulk_create([
+                BlogPost(title=f'Post {i}', content='Benchmark post body', author='Bench') for i in range(options['posts'])
+            ])
+            post_ids = list(BlogPost.objects.values_list('id', flat=True))
+            cache.clear()
+            # Measure the database, not the flood protection
+            unlimited = (10 ** 9, 1)
+            with override_settings(CONTACT_RATE_LIMIT_PER_IP=unlimited, CONTACT_RATE_LIMIT_GLOBAL=unlimited):
+                caches[settings.CONTACT_RATE_LIMIT_CACHE].clear()
+                result = self.drive(post_ids, options)
+            result['profile'] = self.describe_profile()
+        finally:
+            connection.close()
+            teardown_databases(old_config, verbosity=0)
+        return result
+
+    def describe_profile(self):
+        profile = f'{connection.vendor}, CONN_MAX_AGE={connection.settings_dict["CONN_MAX_AGE"]}'
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                profile += f', journal_mode={cursor.fetchone()[0]}'
+        return profile
+
+    def drive(self, post_ids, options):
+        handler = WSGIHandler()
+        latencies = {'read': [], 'write': []}
+        errors = {'read': 0, 'write': 0}
+        lock = threading.Lock()
+
+        def worker(number):
+            rng = random.Random(options['seed'] + number)
+            client = WSGIClient(handler, f'10.0.{number // 250}.{number % 250 + 1}')
+            client.prepare_contact_form()
+            for i in range(options['requests']):
+                if rng.random() < options['write_ratio']:
+                    kind = 'write'
+                    started = time.perf_counter()
+                    status = client.submit_contact_form(f'Worker {number} message {i}')
+                else:
+                    kind = 'read'
+                    path = rng.choice(['/blog/', f'/blog/{rng.choice(post_ids)}/'])
+                    started = time.perf_counter()
+                    status = client.get(path)[0]
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies[kind].append(elapsed)
+                    if status >= 400:
+                        errors[kind] += 1
+            connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            list(pool.map(worker, range(options['workers'])))
+        elapsed = time.perf_counter() - started
+
+        result = {}
+        for kind in ('read', 'write'):
+            result[kind] = summarize(latencies[kind], elapsed)
+            result[kind]['errors'] = errors[kind]
+        return result
+
+
+class WSGIClient:
+    """Minimal cookie-keeping client that goes through the real WSGI handler.
+
+    Unlike django.test.Client, it keeps the request_finished handling that
+    closes or persists connections according to CONN_MAX_AGE.
+    """
+
+    def __init__(self, handler, remote_addr):
+        self.handler = handler
+        self.remote_addr = remote_addr
+        self.cookies = SimpleCookie()
+        self.csrf_token = None
+
+    def request(self, method, path, body=b''):
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost',
+            'HTTP_COOKIE': '; '.join(f'{key}={morsel.value}' for key, morsel in self.cookies.items()),
+            'REMOTE_ADDR': self.remote_addr,
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http',
+        }
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split()[0])
+            for name, value in headers:
+                if name.lower() == 'set-cookie':
+                    self.cookies.load(value)
+
+        chunks = self.handler(environ, start_response)
+        content = b''.join(chunks)
+        chunks.close()
+        return response['status'], content
+
+    def get(self, path):
+        return self.request('GET', path)
+
+    def prepare_contact_form(self):
+        """Fetch the home page for its CSRF cookie and token"""
+        _, content = self.get('/')
+        self.csrf_token = re.search(rb'name="csrfmiddlewaretoken" value="([^"]+)"', content).group(1).decode()
+
+    def submit_contact_form(self, message):
+        body = urlencode({
+            'csrfmiddlewaretoken': self.csrf_token,
+            'name': 'Benchmark',
+            'email': 'bench@example.com',
+            'subject': 'Benchmark',
+            'message': message,
+        }).encode()
+        status, _ = self.request('POST', '/', body)
+        # Drop the flash message so later requests stay anonymous reads
+        self.cookies.pop('messages', None)
+        return status
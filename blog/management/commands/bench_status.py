@@ -0,0 +1,129 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_databases, teardown_databases
+from app.models import ContactMessage
+
+# How each strategy marks a list of loaded, unread messages as read
+STRATEGIES = {
+    # What mark_as_read() used to do: rewrite every column
+    'save': lambda messages: [message.save() for message in messages],
+    'update_fields': lambda messages: [message.save(update_fields=['is_read']) for message in messages],
+    'mark_as_read': lambda messages: [message.mark_as_read() for message in messages],
+    'bulk': lambda messages: ContactMessage.objects.filter(pk__in=[m.pk for m in messages]).mark_read(),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the bytes sent and written per ContactMessage read-status transition. '
+        'The postgresql profile (WAL bytes from pg_current_wal_insert_lsn) has not been verified against a server yet.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engine', action='append', dest='engines', choices=['sqlite', 'postgresql'],
+                            help='Database profile to run (repeatable); defaults to the configured one')
+        parser.add_argument('--messages', type=int, default=500, help='Transitions per strategy')
+        parser.add_argument('--message-size', type=int, default=2000, help='Characters in each message body')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        engines = options['engines'] or [settings.DB_ENGINE]
+        results = {}
+        for engine in engines:
+            if engine == settings.DB_ENGINE:
+                results[engine] = self.run(options)
+            else:
+                results[engine] = self.run_in_subprocess(engine, options)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f'==> {options["messages"]} transitions per strategy, {options["message_size"]}-character messages'
+        )
+        self.stdout.write(f'{"engine":<11} {"strategy":<14} {"statements":>10} {"sent B/row":>11} {"written B/row":>14}')
+        for engine, result in results.items():
+            for strategy, stats in result.items():
+                self.stdout.write(
+                    f'{engine:<11} {strategy:<14} {stats["statements"]:>10} '
+                    f'{stats["sent_bytes_per_row"]:>11} {stats["written_bytes_per_row"]:>14}'
+                )
+
+    def run_in_subprocess(self, engine, options):
+        """Settings pick the database at import time, so other profiles need a fresh process"""
+        # Not argv[0], which is not manage.py under call_command() or python -m django
+        env = dict(os.environ, PORTFOLIO_DB_ENGINE=engine, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        command = [
+            sys.executable, '-m', 'django', 'bench_status', '--json',
+            '--messages', str(options['messages']), '--message-size', str(options['message_size']),
+        ]
+        result = subprocess.run(command, env=env, capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(f'{engine} run failed:\n{result.stderr}')
+        return json.loads(result.stdout)[engine]
+
+    def run(self, options):
+        if connection.vendor == 'sqlite':
+            # Written bytes are read off the WAL file, so it needs a real file
+            path = os.path.join(tempfile.gettempdir(), 'portfolio-bench-status.sqlite3')
+            connection.settings_dict['TEST']['NAME'] = path
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            if connection.vendor == 'sqlite':
+                with connection.cursor() as cursor:
+                    # Keep every frame in the WAL until wal_position() truncates it
+                    cursor.execute('PRAGMA wal_autocheckpoint = 0')
+            results = {}
+            for strategy, transition in STRATEGIES.items():
+                messages = self.seed(strategy, options)
+                results[strategy] = self.measure(transition, messages)
+        finally:
+            connection.close()
+            teardown_databases(old_config, verbosity=0)
+        return results
+
+    def seed(self, strategy, options):
+        ContactMessage.objects.bulk_create([
+            ContactMessage(
+                name=f'Sender {i}', email=f'sender{i}@example.com', subject=f'{strategy} {i}',
+                message='x' * options['message_size'], ip_address='10.0.0.1',
+                user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+            )
+            for i in range(options['messages'])
+        ])
+        messages = list(ContactMessage.objects.filter(subject__startswith=f'{strategy} '))
+        for message in messages:
+            message.is_read = True
+        return messages
+
+    def measure(self, transition, messages):
+        """Statements issued, their size, and the WAL bytes they caused"""
+        start = self.wal_position(reset=True)
+        with CaptureQueriesContext(connection) as queries:
+            transition(messages)
+        written = self.wal_position() - start
+        sent = sum(len(query['sql'].encode()) for query in queries)
+        return {
+            'statements': len(queries),
+            'sent_bytes_per_row': round(sent / len(messages)),
+            'written_bytes_per_row': round(written / len(messages)),
+        }
+
+    def wal_position(self, reset=False):
+        """Bytes of WAL written so far; ``reset`` empties SQLite's WAL file first"""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), '0/0')")
+                return int(cursor.fetchone()[0])
+            if reset:
+                cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        wal = connection.settings_dict['NAME'] + '-wal'
+        return os.path.getsize(wal) if os.path.exists(wal) else 0
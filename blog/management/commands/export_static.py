@@ -0,0 +1,234 @@
+"""Pre-render the public site to plain files for nginx.
+
+Layout of the output directory:
+
+    index.html, skills/index.html, blog/index.html   top-level pages
+    blog/<id>/index.html                              one file per post
+    blog/cursor/<cursor>/index.html                   older archive pages
+    blog/feed/index.xml                               RSS feed
+    sitemap.xml, sitemap-<n>.xml                      sitemap index and pages
+    static/...                                        fingerprinted assets
+
+nginx can map the archive's ?cursor= links onto the exported pages, and
+serve the feed as XML, with
+
+    location = /blog/ {
+        if ($arg_cursor) { rewrite ^ /blog/cursor/$arg_cursor/ last; }
+    }
+    location = /blog/feed/ { index index.xml; }
+
+The contact form still posts to Django, so proxy POST / upstream, along
+with /csrf/: exported pages are shared by every visitor, so their forms
+carry no token and fetch one from there instead.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Max
+from django.test import Client
+from app.models import Skill, Project, Achievement, Experience
+from blog.models import BlogPost
+from blog.pagination import encode_cursor
+from portfolio.pool import process_pool
+
+MANIFEST_NAME = '.export-manifest.json'
+FEED_PATH = '/blog/feed/'
+
+# The token rendered for the export's own client would fail for everyone else
+CSRF_INPUT = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*"')
+
+
+def render_paths(paths, host):
+    """Render each path with an in-process client; runs inside pool workers too"""
+    client = Client(HTTP_HOST=host)
+    pages = []
+    for path in paths:
+        response = client.get(path)
+        if response.status_code != 200:
+            raise CommandError(f'{path} returned {response.status_code}')
+        # The sitemap pages are streamed
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        pages.append((path, content))
+    return pages
+
+
+class Command(BaseCommand):
+    help = 'Render every public page and static asset to a directory that nginx can serve'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Directory to write the site to')
+        parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes for rendering posts')
+        parser.add_argument('--chunk-size', type=int, default=50, help='Posts rendered per worker task')
+        parser.add_argument('--force', action='store_true', help='Re-render every page, not just changed ones')
+        parser.add_argument('--host', help='Host header for rendering (defaults to the first ALLOWED_HOSTS entry)')
+
+    def handle(self, *args, **options):
+        self.output = os.path.abspath(options['output'])
+        self.host = options['host'] or self.default_host()
+        manifest = {} if options['force'] else self.load_manifest()
+
+        self.stdout.write(f'==> Exporting site to {self.output}...')
+        assets = self.export_assets()
+        asset_version = hashlib.sha256(json.dumps(assets, sort_keys=True).encode()).hexdigest()[:12]
+
+        # Every page's fingerprint covers its rows and the asset hashes
+        pages = {path: f'{fingerprint}:{asset_version}' for path, fingerprint in self.collect_pages().items()}
+        stale = [path for path, fingerprint in pages.items()
+                 if manifest.get('pages', {}).get(path) != fingerprint or not os.path.exists(self.page_file(path))]
+
+        self.write_pages(self.render(stale, options), assets)
+        removed = self.remove_pages(set(manifest.get('pages', {})) - set(pages))
+
+        self.save_manifest({'assets': assets, 'pages': pages})
+        self.stdout.write(self.style.SUCCESS(
+            f'==> Rendered {len(stale)} of {len(pages)} pages, removed {removed}, copied {len(assets)} assets'
+        ))
+
+    def default_host(self):
+        hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*']
+        return hosts[0] if hosts else 'localhost'
+
+    def collect_pages(self):
+        """Map each public path to a fingerprint of the rows it shows"""
+        posts = aggregate(BlogPost, 'updated_on')
+        content = ':'.join([
+            aggregate(Skill, 'updated_at'), aggregate(Project, 'updated_at'),
+            aggregate(Achievement, 'updated_at'), aggregate(Experience, 'updated_at'), posts,
+        ])
+        pages = {
+            '/': content,
+            '/skills/': aggregate(Skill, 'updated_at'),
+            '/blog/': posts,
+            FEED_PATH: posts,
+        }
+
+        # Archive pages start after every BLOG_PAGE_SIZE-th post
+        page_size = settings.BLOG_PAGE_SIZE
+        ordered = BlogPost.objects.order_by('-created_on', '-id').values_list('id', 'created_on', 'updated_on')
+        count = 0
+        for count, (pk, created_on, updated_on) in enumerate(ordered.iterator(chunk_size=2000), start=1):
+            pages[f'/blog/{pk}/'] = updated_on.isoformat()
+            if count % page_size == 0:
+                cursor = encode_cursor(BlogPost(id=pk, created_on=created_on))
+                pages[f'/blog/?cursor={cursor}'] = posts
+
+        # The sitemap index only lists its pages, so it changes with their number
+        sitemap_pages = max(1, math.ceil(count / settings.SITEMAP_PAGE_SIZE))
+        pages['/sitemap.xml'] = str(sitemap_pages)
+        for page in range(1, sitemap_pages + 1):
+            pages[f'/sitemap-{page}.xml'] = posts
+        return pages
+
+    def render(self, paths, options):
+        posts = [path for path in paths if is_post(path)]
+        others = [path for path in paths if not is_post(path)]
+        rendered = render_paths(others, self.host)
+
+        # An in-memory database cannot be shared with worker processes
+        in_memory = connection.vendor == 'sqlite' and connection.is_in_memory_db()
+        if options['jobs'] <= 1 or in_memory or len(posts) <= options['chunk_size']:
+            return rendered + render_paths(posts, self.host)
+
+        chunks = [posts[i:i + options['chunk_size']] for i in range(0, len(posts), options['chunk_size'])]
+        with process_pool(options['jobs']) as pool:
+            for pages in pool.map(render_paths, chunks, [self.host] * len(chunks)):
+                rendered.extend(pages)
+        return rendered
+
+    def export_assets(self):
+        """Copy the project's static files under content-hashed names; returns name -> hashed name"""
+        # Files already run through collectstatic keep their minified,
+        # hashed name and precompressed siblings from STATIC_ROOT
+        collected = getattr(staticfiles_storage, 'hashed_files', {})
+        assets = {}
+        # Only STATICFILES_DIRS: the public pages never link to app assets such as admin's
+        for name, storage in finders.FileSystemFinder().list(['CVS', '.*', '*~']):
+            if name in assets:
+                continue
+            if collected.get(name):
+                assets[name] = collected[name]
+                for suffix in ('', '.gz', '.br'):
+                    source = staticfiles_storage.path(collected[name]) + suffix
+                    if os.path.exists(source):
+                        self.copy_asset(collected[name] + suffix, source)
+                continue
+            with storage.open(name) as f:
+                data = f.read()
+            root, ext = os.path.splitext(name)
+            hashed = f'{root}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+            target = os.path.join(self.output, 'static', hashed)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, 'wb') as f:
+                    f.write(data)
+            assets[name] = hashed
+        return assets
+
+    def copy_asset(self, name, source):
+        target = os.path.join(self.output, 'static', name)
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, target)
+
+    def write_pages(self, pages, assets):
+        static_url = '/' + settings.STATIC_URL.lstrip('/')
+        for path, content in pages:
+            html = CSRF_INPUT.sub(r'\1"', content.decode())
+            for name, hashed in assets.items():
+                html = html.replace(f'{static_url}{name}"', f'{static_url}{hashed}"')
+            target = self.page_file(path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'w', encoding='utf-8') as f:
+                f.write(html)
+
+    def remove_pages(self, paths):
+        for path in paths:
+            if path.endswith('.xml'):
+                if os.path.exists(self.page_file(path)):
+                    os.remove(self.page_file(path))
+                continue
+            directory = os.path.dirname(self.page_file(path))
+            if path != '/' and os.path.isdir(directory):
+                shutil.rmtree(directory)
+        return len(paths)
+
+    def page_file(self, path):
+        path, _, query = path.partition('?cursor=')
+        if query:
+            path = f'{path}cursor/{query}/'
+        if path.endswith('.xml'):
+            return os.path.join(self.output, path.strip('/'))
+        index = 'index.xml' if path == FEED_PATH else 'index.html'
+        return os.path.join(self.output, path.strip('/'), index)
+
+    def load_manifest(self):
+        try:
+            with open(os.path.join(self.output, MANIFEST_NAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self, manifest):
+        os.makedirs(self.output, exist_ok=True)
+        with open(os.path.join(self.output, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+
+def is_post(path):
+    return path.startswith('/blog/') and path.rstrip('/').rsplit('/', 1)[-1].isdigit()
+
+
+def aggregate(model, timestamp_field):
+    """Fingerprint a table by its newest timestamp and row count"""
+    stats = model.objects.aggregate(latest=Max(timestamp_field), count=Count('id'))
+    latest = stats['latest'].isoformat() if stats['latest'] else ''
+    return f'{latest}/{stats["count"]}'
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from blog.search import rebuild_indexes
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from the blog post and project tables'
+
+    def handle(self, *args, **options):
+        self.stdout.write('==> Rebuilding search index...')
+        tables = rebuild_indexes()
+        if not tables:
+            self.stdout.write('[*] Full-text search needs SQLite; nothing to rebuild')
+            return
+        for table in tables:
+            self.stdout.write(f'[+] Rebuilt {table}')
+        self.stdout.write(self.style.SUCCESS('==> Search index rebuilt!'))
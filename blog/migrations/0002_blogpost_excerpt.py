@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:34
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpts(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    batch = []
+    for post in BlogPost.objects.only('id', 'content').iterator(chunk_size=500):
+        post.excerpt = Truncator(post.content).words(25, truncate=' …')
+        batch.append(post)
+        if len(batch) >= 500:
+            BlogPost.objects.bulk_update(batch, ['excerpt'])
+            batch = []
+    if batch:
+        BlogPost.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, help_text='Card summary, generated from content on save'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['-created_on', '-id'], name='blog_created_id_idx'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
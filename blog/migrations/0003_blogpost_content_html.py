@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:35
+
+from django.db import migrations, models
+from django.utils.html import linebreaks
+
+
+def fill_content_html(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    batch = []
+    for post in BlogPost.objects.only('id', 'content').iterator(chunk_size=500):
+        post.content_html = linebreaks(post.content, autoescape=True)
+        batch.append(post)
+        if len(batch) >= 500:
+            BlogPost.objects.bulk_update(batch, ['content_html'])
+            batch = []
+    if batch:
+        BlogPost.objects.bulk_update(batch, ['content_html'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_blogpost_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False, help_text='Rendered content, generated on save'),
+        ),
+        migrations.RunPython(fill_content_html, migrations.RunPython.noop),
+    ]
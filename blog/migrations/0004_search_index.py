@@ -0,0 +1,56 @@
+from django.db import migrations
+
+# External-content FTS5 tables kept in sync by triggers, so bulk inserts and
+# queryset updates are indexed too. rowid is the primary key of the source row.
+SEARCH_INDEXES = {
+    'blog_blogpost': ('title', 'content'),
+    'app_project': ('title', 'short_description', 'description', 'key_features'),
+}
+
+
+def index_sql(table, columns):
+    fts = f'{table}_fts'
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{c}' for c in columns)
+    old = ', '.join(f'old.{c}' for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def create_search_indexes(apps, schema_editor):
+    # FTS5 is SQLite only; other databases fall back to icontains search
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, columns in SEARCH_INDEXES.items():
+        for statement in index_sql(table, columns):
+            schema_editor.execute(statement)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table in SEARCH_INDEXES:
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_fts_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {table}_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_blogpost_content_html'),
+        ('app', '0004_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,79 @@
+import hashlib
+import json
+from collections import Counter
+
+from django.db import migrations, models
+
+# On SQLite, adding the unique constraint rebuilds the table, which drops the
+# search triggers from 0004 (app.0005 rebuilds app_project the same way).
+# Recreate them and rebuild both indexes afterwards.
+SEARCH_INDEXES = {
+    'blog_blogpost': ('title', 'content'),
+    'app_project': ('title', 'short_description', 'description', 'key_features'),
+}
+
+
+def trigger_sql(table, columns):
+    fts = f'{table}_fts'
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{c}' for c in columns)
+    old = ', '.join(f'old.{c}' for c in columns)
+    return [
+        f'DROP TRIGGER IF EXISTS {fts}_ai',
+        f'DROP TRIGGER IF EXISTS {fts}_ad',
+        f'DROP TRIGGER IF EXISTS {fts}_au',
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def seed_key(values):
+    # A frozen copy of populate_portfolio.seed_key
+    return hashlib.sha1(json.dumps([str(value) for value in values]).encode()).hexdigest()
+
+
+def backfill_seed_keys(apps, schema_editor):
+    """Key existing posts by title, as in app.0005; shared titles stay unkeyed"""
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    keys = {pk: seed_key([title]) for pk, title in BlogPost.objects.values_list('pk', 'title')}
+    counts = Counter(keys.values())
+    keyed = [BlogPost(pk=pk, seed_key=key) for pk, key in keys.items() if counts[key] == 1]
+    BlogPost.objects.bulk_update(keyed, ['seed_key'], batch_size=500)
+
+
+def restore_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, columns in SEARCH_INDEXES.items():
+        for statement in trigger_sql(table, columns):
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_search_index'),
+        ('app', '0005_natural_keys'),
+    ]
+
+    operations = [
+        # Runs last when migrating backwards, after the field and constraint are removed
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.AddField(
+            model_name='blogpost',
+            name='seed_key',
+            field=models.CharField(blank=True, editable=False, help_text='Set by populate_portfolio on the rows it loads and upserts on; empty for rows added in the admin', max_length=40, null=True),
+        ),
+        migrations.RunPython(backfill_seed_keys, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='blogpost',
+            constraint=models.UniqueConstraint(fields=('seed_key',), name='blogpost_seed_key'),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
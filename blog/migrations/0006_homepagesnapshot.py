@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_blogpost_seed_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HomepageSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.JSONField()),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
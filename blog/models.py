@@ -1,16 +1,65 @@
 from django.db import models
+from django.utils.html import linebreaks
+from django.utils.text import Truncator
+
+# Number of words shown on blog cards
+EXCERPT_WORDS = 25
 
 
 # Create your models here.
 class BlogPost(models.Model):
     title = models.CharField(max_length=300)
     content = models.TextField()  
+    excerpt = models.TextField(blank=True, editable=False, help_text="Card summary, generated from content on save")
+    content_html = models.TextField(blank=True, editable=False, help_text="Rendered content, generated on save")
     created_on = models.DateTimeField(auto_now_add=True)
     updated_on = models.DateTimeField(auto_now=True)
     author = models.CharField(max_length=300)  
+    seed_key = models.CharField(max_length=40, null=True, blank=True, editable=False, help_text="Set by populate_portfolio on the rows it loads and upserts on; empty for rows added in the admin")
+
+    class Meta:
+        indexes = [
+            # Matches the archive ordering and the keyset seek on (created_on, id)
+            models.Index(fields=['-created_on', '-id'], name='blog_created_id_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['seed_key'], name='blogpost_seed_key'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.render_content()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *RENDERED_FIELDS}
+        super().save(*args, **kwargs)
+
+    def render_content(self):
+        """Refresh the stored excerpt and HTML from content"""
+        self.excerpt = make_excerpt(self.content)
+        self.content_html = render_content_html(self.content)
+
+
+# Columns derived from content by BlogPost.render_content()
+RENDERED_FIELDS = ('excerpt', 'content_html')
+
 
+def make_excerpt(content):
+    """Same output as the truncatewords template filter"""
+    return Truncator(content).words(EXCERPT_WORDS, truncate=' …')
 
+
+def render_content_html(content):
+    """Same output as the linebreaks template filter"""
+    return linebreaks(content, autoescape=True)
+
+
+class HomepageSnapshot(models.Model):
+    """The rows shown on the home page, denormalized into one JSON document (see snapshot.py)"""
+    data = models.JSONField()
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'Home page snapshot built {self.built_at:%Y-%m-%d %H:%M:%S}'
@@ -0,0 +1,68 @@
+"""Keyset (cursor) pagination for the blog archive.
+
+Pages seek on (created_on, id) instead of using OFFSET, so fetching a deep
+page costs the same as fetching the first one.
+"""
+import base64
+import binascii
+
+from django.db.models import Q
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(post):
+    """Encode the position just after ``post`` as an opaque URL token"""
+    raw = f'{post.created_on.isoformat()}|{post.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (created_on, id) for a cursor, raising Http404 if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_on, pk = raw.rsplit('|', 1)
+        created_on = parse_datetime(created_on)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise Http404('Invalid page cursor')
+    if created_on is None:
+        raise Http404('Invalid page cursor')
+    return created_on, pk
+
+
+def paginate_by_cursor(queryset, cursor, page_size):
+    """Return (posts, next_cursor) for the page starting after ``cursor``.
+
+    ``queryset`` must not be ordered yet; the newest posts come first.
+    """
+    # Fetch one extra row to find out whether there is a next page
+    posts = list(seek(queryset, cursor)[:page_size + 1])
+    return split_page(posts, page_size)
+
+
+async def apaginate_by_cursor(queryset, cursor, page_size):
+    """Async version of paginate_by_cursor()"""
+    posts = [post async for post in seek(queryset, cursor)[:page_size + 1]]
+    return split_page(posts, page_size)
+
+
+def seek(queryset, cursor):
+    queryset = queryset.order_by('-created_on', '-id')
+    if cursor:
+        created_on, pk = decode_cursor(cursor)
+        # The redundant upper bound lets SQLite seek the index to the cursor
+        # instead of scanning down to it from the newest post
+        queryset = queryset.filter(
+            Q(created_on__lt=created_on) | Q(created_on=created_on, id__lt=pk),
+            created_on__lte=created_on,
+        )
+    return queryset
+
+
+def split_page(posts, page_size):
+    next_cursor = None
+    if len(posts) > page_size:
+        posts = posts[:page_size]
+        next_cursor = encode_cursor(posts[-1])
+    return posts, next_cursor
@@ -0,0 +1,51 @@
+"""Token-bucket rate limiting backed by Django's cache framework.
+
+A bucket holds up to ``burst`` tokens and refills at ``burst / period``
+tokens per second. Each allowed action takes one token. The read and
+write are not atomic, so concurrent requests can occasionally both take
+the last token; that is fine for flood protection.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def take_tokens(buckets, now=None):
+    """Take a token from every ``(key, burst, period)`` bucket, or from none.
+
+    Returns seconds to wait until all of them have a token, 0 if allowed.
+    A request one bucket rejects costs nothing in the others.
+    """
+    cache = caches[settings.CONTACT_RATE_LIMIT_CACHE]
+    now = time.time() if now is None else now
+    stored = cache.get_many([key for key, _, _ in buckets])
+
+    wait = 0
+    refilled = []
+    for key, burst, period in buckets:
+        rate = burst / period
+        tokens, updated = stored.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        if tokens < 1:
+            wait = max(wait, (1 - tokens) / rate)
+        refilled.append((key, tokens, period))
+    if wait:
+        return wait
+    for key, tokens, period in refilled:
+        # An untouched bucket is full again after one period, so let it expire
+        cache.set(key, (tokens - 1, now), timeout=period)
+    return 0
+
+
+def take_token(key, burst, period, now=None):
+    """Take a token from the bucket at ``key``; returns seconds to wait, 0 if allowed"""
+    return take_tokens([(key, burst, period)], now)
+
+
+def check_contact_rate(ip):
+    """Return seconds until ``ip`` may post the contact form again, 0 if it may now"""
+    return take_tokens([
+        (f'ratelimit:contact:ip:{ip}', *settings.CONTACT_RATE_LIMIT_PER_IP),
+        ('ratelimit:contact:global', *settings.CONTACT_RATE_LIMIT_GLOBAL),
+    ])
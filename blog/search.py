@@ -0,0 +1,224 @@
+"""Full-text search over blog posts and projects.
+
+On SQLite the search runs against the FTS5 tables created by migrations
+blog.0004 and app.0006, which triggers keep in sync with their source
+tables. SQLite drops those triggers whenever a migration remakes a source
+table, so restore_search_triggers() puts them back after every migrate.
+Other databases fall back to icontains filters.
+"""
+import re
+from dataclasses import dataclass
+
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from app.models import ContactMessage, Project
+from .models import BlogPost
+
+# Marks placed around matches by snippet(), swapped for <mark> after escaping
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    model: type
+    columns: tuple
+    weights: tuple
+
+    @property
+    def table(self):
+        return f'{self.model._meta.db_table}_fts'
+
+
+SEARCH_INDEXES = {
+    'post': SearchIndex(BlogPost, ('title', 'content'), (10.0, 1.0)),
+    'project': SearchIndex(Project, ('title', 'short_description', 'description', 'key_features'), (10.0, 4.0, 1.0, 2.0)),
+    # Admin-only; the public search never includes contact messages
+    'contact': SearchIndex(ContactMessage, ('name', 'email', 'subject', 'message'), (4.0, 4.0, 2.0, 1.0)),
+}
+
+# Extra columns needed to link to a result
+LINK_FIELDS = {
+    'post': (),
+    'project': ('demo_url', 'github_url'),
+}
+
+
+@dataclass
+class SearchResult:
+    kind: str
+    object_id: int
+    title: str
+    snippet: str
+    url: str
+
+
+def is_fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def trigger_sql(table, fts, columns):
+    """Statements creating the triggers that keep ``fts`` in sync with ``table``"""
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{c}' for c in columns)
+    old = ', '.join(f'old.{c}' for c in columns)
+    return [
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+
+def restore_search_triggers(using='default'):
+    """Recreate missing sync triggers and reindex their tables; returns the tables fixed"""
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return []
+    restored = []
+    with db.cursor() as cursor:
+        tables = set(db.introspection.table_names(cursor))
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        triggers = {row[0] for row in cursor.fetchall()}
+        for index in SEARCH_INDEXES.values():
+            # Not migrated that far yet
+            if index.table not in tables:
+                continue
+            names = {f'{index.table}_{suffix}' for suffix in ('ai', 'ad', 'au')}
+            if names <= triggers:
+                continue
+            for name in names:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            for statement in trigger_sql(index.model._meta.db_table, index.table, index.columns):
+                cursor.execute(statement)
+            # Writes made while the triggers were missing are not indexed
+            cursor.execute(f"INSERT INTO {index.table}({index.table}) VALUES ('rebuild')")
+            restored.append(index.model._meta.db_table)
+    return restored
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query: every word must match, as a prefix"""
+    tokens = re.findall(r'\w+', text)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search(text, kinds=('post', 'project'), limit=20):
+    """Ranked results for ``text`` across the given kinds, best first"""
+    match = build_match_query(text)
+    if not match:
+        return []
+    if not is_fts_available():
+        return fallback_search(text, kinds, limit)
+
+    selects = []
+    params = []
+    for kind in kinds:
+        index = SEARCH_INDEXES[kind]
+        weights = ', '.join(str(weight) for weight in index.weights)
+        selects.append(
+            f"SELECT '{kind}', rowid, snippet({index.table}, -1, '{MATCH_START}', '{MATCH_END}', '…', 16), "
+            f"bm25({index.table}, {weights}) AS rank "
+            f"FROM {index.table} WHERE {index.table} MATCH %s"
+        )
+        params.append(match)
+    sql = ' UNION ALL '.join(selects) + ' ORDER BY rank LIMIT %s'
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, limit])
+        rows = cursor.fetchall()
+    return build_results([(kind, object_id, highlight(snippet)) for kind, object_id, snippet, _ in rows])
+
+
+def matching_ids(kind, text):
+    """Subquery of the primary keys of ``kind`` objects matching ``text``"""
+    index = SEARCH_INDEXES[kind]
+    return RawSQL(f'SELECT rowid FROM {index.table} WHERE {index.table} MATCH %s', [build_match_query(text)])
+
+
+def fallback_search(text, kinds, limit):
+    rows = []
+    for kind in kinds:
+        index = SEARCH_INDEXES[kind]
+        query = Q()
+        for token in re.findall(r'\w+', text):
+            token_query = Q()
+            for column in index.columns:
+                token_query |= Q(**{f'{column}__icontains': token})
+            query &= token_query
+        snippet_column = index.columns[1]
+        for obj in index.model.objects.filter(query).only('id', snippet_column)[:limit]:
+            rows.append((kind, obj.pk, escape(getattr(obj, snippet_column)[:200])))
+    return build_results(rows[:limit])
+
+
+def build_results(rows):
+    """Attach titles and links, with one query per kind"""
+    ids = {}
+    for kind, object_id, _ in rows:
+        ids.setdefault(kind, []).append(object_id)
+    objects = {
+        kind: SEARCH_INDEXES[kind].model.objects.only('id', 'title', *LINK_FIELDS[kind]).in_bulk(kind_ids)
+        for kind, kind_ids in ids.items()
+    }
+
+    results = []
+    for kind, object_id, snippet in rows:
+        obj = objects[kind].get(object_id)
+        if obj is None:
+            continue
+        results.append(SearchResult(kind, object_id, obj.title, mark_safe(snippet), get_url(kind, obj)))
+    return results
+
+
+def get_url(kind, obj):
+    if kind == 'post':
+        return reverse('blog_detail', args=[obj.pk])
+    return obj.demo_url or obj.github_url or reverse('index') + '#projects'
+
+
+def highlight(snippet):
+    return escape(snippet).replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>')
+
+
+def rebuild_indexes():
+    """Rebuild every FTS table from its source table"""
+    if not is_fts_available():
+        return []
+    with connection.cursor() as cursor:
+        for index in SEARCH_INDEXES.values():
+            cursor.execute(f"INSERT INTO {index.table}({index.table}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {index.table}({index.table}) VALUES ('optimize')")
+    return [index.table for index in SEARCH_INDEXES.values()]
+
+
+class SearchIndexAdminMixin:
+    """Answer the changelist search box from the FTS index of ``search_index_kind``.
+
+    search_fields the index does not cover are still searched with
+    icontains (every word in one of them), and either kind of match counts.
+    """
+    search_index_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not build_match_query(search_term) or not is_fts_available():
+            return super().get_search_results(request, queryset, search_term)
+        query = Q(pk__in=matching_ids(self.search_index_kind, search_term))
+        columns = SEARCH_INDEXES[self.search_index_kind].columns
+        other_fields = [field for field in self.get_search_fields(request) if field not in columns]
+        if other_fields:
+            words = Q()
+            for token in re.findall(r'\w+', search_term):
+                word = Q()
+                for field in other_fields:
+                    word |= Q(**{f'{field}__icontains': token})
+                words &= word
+            query |= words
+        return queryset.filter(query), False
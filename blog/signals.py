@@ -0,0 +1,133 @@
+from django.db import DatabaseError, connection, connections, transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.utils import timezone
+
+from app.models import Skill, Project, Achievement, Experience
+from .cache import POSTS_VERSION_KEY, SKILLS_VERSION_KEY, bump_content_version
+from .models import BlogPost, HomepageSnapshot
+from .search import restore_search_triggers
+from .snapshot import rebuild_snapshot
+
+# Models whose rows are rendered on the cached pages
+CONTENT_MODELS = (Skill, Project, Achievement, Experience, BlogPost)
+
+
+def content_changed(sender, **kwargs):
+    """Bump the content version now and again once the transaction commits.
+
+    The second bump discards any page rendered by a concurrent request
+    between the write and the commit.
+    """
+    bump_content_version()
+    transaction.on_commit(bump_content_version)
+
+
+def skills_changed(sender, **kwargs):
+    """Same as content_changed(), for caches that only depend on skills"""
+    bump_content_version(SKILLS_VERSION_KEY)
+    transaction.on_commit(lambda: bump_content_version(SKILLS_VERSION_KEY))
+
+
+def posts_changed(sender, **kwargs):
+    """Same as content_changed(), for caches that only depend on blog posts"""
+    bump_content_version(POSTS_VERSION_KEY)
+    transaction.on_commit(lambda: bump_content_version(POSTS_VERSION_KEY))
+
+
+def snapshot_changed(sender, **kwargs):
+    """Rebuild the home page snapshot, at most once per transaction.
+
+    Outside a transaction the rebuild happens now. Inside one, a single
+    rebuild runs once it commits, however many rows it changed; it bumps
+    the content version again to discard pages rendered from the old
+    snapshot in between.
+    """
+    action = kwargs.get('action')
+    if action is not None and not action.startswith('post_'):
+        return
+    outer = outermost_atomic()
+    if outer is None:
+        rebuild_snapshot()
+        return
+    # Already queued for this transaction? A rollback drops it from run_on_commit
+    pending = getattr(outer, 'snapshot_rebuild', None)
+    if pending is not None and any(func is pending for _, func, _ in connection.run_on_commit):
+        return
+
+    def rebuild():
+        outer.snapshot_rebuild = None
+        rebuild_snapshot()
+        bump_content_version()
+
+    outer.snapshot_rebuild = rebuild
+    transaction.on_commit(rebuild)
+
+
+def outermost_atomic():
+    """The outermost atomic block the code opened, or None in autocommit.
+
+    TestCase's per-test blocks don't count, as for atomic(durable=True).
+    """
+    return next((block for block in connection.atomic_blocks if not getattr(block, '_from_testcase', False)), None)
+
+
+def snapshot_migrated(sender, using, **kwargs):
+    """Build the snapshot once its table exists, so no page request has to"""
+    if HomepageSnapshot._meta.db_table not in connections[using].introspection.table_names():
+        return
+    try:
+        rebuild_snapshot()
+    except DatabaseError:
+        # Migrated only part way; the first request builds it instead
+        pass
+
+
+def search_triggers_migrated(sender, using, **kwargs):
+    """Put back the full-text sync triggers any migration's table remake dropped"""
+    restore_search_triggers(using)
+
+
+def touch_projects_of_skill(sender, instance, **kwargs):
+    """Project cards show their skills' names, so a skill edit dates them too"""
+    Project.objects.filter(technologies=instance).update(updated_at=timezone.now())
+
+
+def technologies_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Bump updated_at of projects whose technologies were added or removed"""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        projects = Project.objects.filter(pk=instance.pk)
+    elif action == 'pre_clear':
+        projects = Project.objects.filter(technologies=instance)
+    else:
+        projects = Project.objects.filter(pk__in=pk_set)
+    projects.update(updated_at=timezone.now())
+
+
+def connect_signals():
+    for model in CONTENT_MODELS:
+        uid = f'content_changed_{model._meta.label_lower}'
+        post_save.connect(content_changed, sender=model, dispatch_uid=f'{uid}_save')
+        post_delete.connect(content_changed, sender=model, dispatch_uid=f'{uid}_delete')
+
+    post_save.connect(skills_changed, sender=Skill, dispatch_uid='skills_changed_save')
+    post_delete.connect(skills_changed, sender=Skill, dispatch_uid='skills_changed_delete')
+    post_save.connect(posts_changed, sender=BlogPost, dispatch_uid='posts_changed_save')
+    post_delete.connect(posts_changed, sender=BlogPost, dispatch_uid='posts_changed_delete')
+
+    # Keeps Project.updated_at, the key of the cached project cards, current
+    post_save.connect(touch_projects_of_skill, sender=Skill, dispatch_uid='touch_projects_save')
+    pre_delete.connect(touch_projects_of_skill, sender=Skill, dispatch_uid='touch_projects_delete')
+    m2m_changed.connect(technologies_changed, sender=Project.technologies.through, dispatch_uid='technologies_changed')
+
+    for through in (Project.technologies.through, Experience.technologies_used.through):
+        m2m_changed.connect(content_changed, sender=through, dispatch_uid=f'content_changed_{through._meta.label_lower}')
+
+    # Connected last, so it sees the updated_at bumps made by the handlers above
+    for model in CONTENT_MODELS:
+        uid = f'snapshot_changed_{model._meta.label_lower}'
+        post_save.connect(snapshot_changed, sender=model, dispatch_uid=f'{uid}_save')
+        post_delete.connect(snapshot_changed, sender=model, dispatch_uid=f'{uid}_delete')
+    for through in (Project.technologies.through, Experience.technologies_used.through):
+        m2m_changed.connect(snapshot_changed, sender=through, dispatch_uid=f'snapshot_changed_{through._meta.label_lower}')
@@ -0,0 +1,128 @@
+"""Denormalized copy of everything the home page shows.
+
+Rendering the home page used to read five tables plus the project
+technologies on every page cache miss. The snapshot keeps the featured
+rows of each section, and each project's resolved tech list, as JSON in a
+single HomepageSnapshot row. Signals rebuild it after each change, once
+per transaction (see signals.py), so a miss reads one row and rehydrates
+unsaved model instances that render exactly like the originals.
+"""
+from asgiref.sync import sync_to_async
+from django.db.models import DEFERRED
+
+from app.models import Skill, Project, Achievement, Experience
+from .models import BlogPost, HomepageSnapshot
+
+SNAPSHOT_PK = 1
+
+# Section -> model its rows rehydrate into
+SECTION_MODELS = {
+    'skills': Skill,
+    'projects': Project,
+    'achievements': Achievement,
+    'experiences': Experience,
+    'recent_posts': BlogPost,
+}
+
+
+def home_sections():
+    """The featured content of the home page, as querysets"""
+    return {
+        'skills': Skill.objects.filter(is_featured=True),
+        'projects': Project.objects.filter(is_featured=True).prefetch_related('technologies'),
+        'achievements': Achievement.objects.filter(is_featured=True)[:3],
+        'experiences': Experience.objects.filter(is_featured=True)[:2],
+        'recent_posts': BlogPost.objects.only('id', 'title', 'author', 'created_on', 'excerpt').order_by('-created_on')[:3],
+    }
+
+
+def build_snapshot():
+    """Read the home page sections and return them as a JSON-serializable dict"""
+    data = {}
+    for section, queryset in home_sections().items():
+        rows = []
+        for obj in queryset:
+            row = {'fields': dump_fields(obj)}
+            if section == 'projects':
+                row['technologies'] = obj.get_tech_list()
+            rows.append(row)
+        data[section] = rows
+    return data
+
+
+def rebuild_snapshot():
+    """Store a fresh snapshot; returns its data"""
+    data = build_snapshot()
+    # One upsert statement whether or not the row exists yet
+    HomepageSnapshot.objects.bulk_create(
+        [HomepageSnapshot(pk=SNAPSHOT_PK, data=data)],
+        update_conflicts=True, unique_fields=['id'], update_fields=['data', 'built_at'],
+    )
+    return data
+
+
+def dump_fields(obj):
+    """Loaded concrete field values of ``obj`` in their string form"""
+    deferred = obj.get_deferred_fields()
+    fields = {}
+    for field in obj._meta.concrete_fields:
+        if field.attname in deferred:
+            continue
+        value = field.value_from_object(obj)
+        fields[field.attname] = None if value is None else field.value_to_string(obj)
+    return fields
+
+
+def load_sections(data):
+    """Rehydrate snapshot data into lists of model instances, without queries"""
+    sections = {}
+    for section, model in SECTION_MODELS.items():
+        objects = []
+        for row in data.get(section, []):
+            obj = model.from_db(None, *field_values(model, row['fields']))
+            if 'technologies' in row:
+                # get_tech_list() reads the prefetched technologies
+                set_prefetched(obj, 'technologies', [Skill(name=name) for name in row['technologies']])
+            objects.append(obj)
+        sections[section] = objects
+    return sections
+
+
+def field_values(model, fields):
+    """from_db() arguments for stored ``fields``, in concrete field order.
+
+    jsonb does not keep object keys in insertion order, so the order is
+    taken from the model and fields missing from the row stay deferred.
+    """
+    names, values = [], []
+    for field in model._meta.concrete_fields:
+        if field.attname in fields:
+            names.append(field.attname)
+            values.append(field.to_python(fields[field.attname]))
+        else:
+            values.append(DEFERRED)
+    return names, values
+
+
+def set_prefetched(obj, name, related):
+    """Fill a many-to-many manager's prefetch cache the way prefetch_related() does"""
+    queryset = getattr(obj, name).all()
+    queryset._result_cache = related
+    queryset._prefetch_done = True
+    obj._prefetched_objects_cache = {name: queryset}
+
+
+def get_home_sections():
+    """The home page sections from the snapshot, built on first use"""
+    data = HomepageSnapshot.objects.filter(pk=SNAPSHOT_PK).values_list('data', flat=True).first()
+    if data is None:
+        data = rebuild_snapshot()
+    return load_sections(data)
+
+
+async def aget_home_sections():
+    """Async version of get_home_sections()"""
+    data = await HomepageSnapshot.objects.filter(pk=SNAPSHOT_PK).values_list('data', flat=True).afirst()
+    if data is None:
+        data = await sync_to_async(rebuild_snapshot)()
+    return load_sections(data)
@@ -1,3 +1,703 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import brotli
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.templatetags.static import static
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.urls import reverse
+
+from app.models import ContactMessage, Project, Skill
+from portfolio.middleware import QueryBudgetExceeded
+from portfolio.minify import minify_css, minify_html
+from portfolio.pool import process_pool
+from portfolio.storage import CompressedManifestStaticFilesStorage
+from . import feeds, views
+from .models import BlogPost, HomepageSnapshot
+from .ratelimit import take_token
+from .search import SEARCH_INDEXES, search
+from .snapshot import get_home_sections, load_sections, rebuild_snapshot
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class HomePageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches['ratelimit'].clear()
+        self.skill = Skill.objects.create(name='Python', category='programming', proficiency=90, description='Language')
+
+    def test_cached_home_page_skips_database(self):
+        # The second request carries the CSRF cookie and caches the validators
+        self.client.get(reverse('index'))
+        self.client.get(reverse('index'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('index'))
+        self.assertContains(response, '<div class="skill-name">Python</div>')
+
+    def test_content_change_invalidates_cache(self):
+        self.client.get(reverse('index'))
+        BlogPost.objects.create(title='Fresh Post', content='Some content', author='Mahendra')
+        self.assertContains(self.client.get(reverse('index')), 'Fresh Post')
+
+        self.skill.name = 'Rust'
+        self.skill.save()
+        content = self.client.get(reverse('index')).content.decode()
+        self.assertIn('<div class="skill-name">Rust</div>', content)
+        self.assertNotIn('<div class="skill-name">Python</div>', content)
+
+    def test_cached_page_has_working_csrf_and_messages(self):
+        client = Client(enforce_csrf_checks=True)
+        client.get(reverse('index'))
+        response = client.get(reverse('index'))
+        token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', response.content.decode()).group(1)
+        self.assertNotIn('placeholder', token)
+
+        response = client.post(reverse('index'), {
+            'csrfmiddlewaretoken': token,
+            'name': 'Visitor',
+            'email': 'visitor@example.com',
+            'subject': 'Hello',
+            'message': 'I would like to talk about a project.',
+        }, follow=True)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertContains(response, 'Thank you for your message!')
+        self.assertNotContains(client.get(reverse('index')), 'Thank you for your message!')
+
+
+@override_settings(BLOG_PAGE_SIZE=5, QUERY_BUDGET_RAISE=True)
+class BlogListPaginationTests(TestCase):
+    def setUp(self):
+        for i in range(12):
+            BlogPost.objects.create(title=f'Post {i}', content=f'Body of post {i}', author='Mahendra')
+        # Give several posts the same timestamp so ties are broken by id
+        BlogPost.objects.filter(title__in=['Post 3', 'Post 4', 'Post 5', 'Post 6']).update(created_on=timezone.now())
+
+    def test_cursor_pages_cover_every_post_once(self):
+        # Compute the shared conditional GET validators up front
+        self.client.get(reverse('blog-list'))
+        seen = []
+        cursor = None
+        while True:
+            url = reverse('blog-list') + (f'?cursor={cursor}' if cursor else '')
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            seen.extend(post.title for post in response.context['posts'])
+            cursor = response.context['next_cursor']
+            if not cursor:
+                break
+        expected = list(BlogPost.objects.order_by('-created_on', '-id').values_list('title', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_list_uses_stored_excerpt(self):
+        BlogPost.objects.create(title='Long', content=' '.join(['word'] * 40), author='Mahendra')
+        response = self.client.get(reverse('blog-list'))
+        self.assertContains(response, ' '.join(['word'] * 25) + ' …')
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse('blog-list') + '?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+
+class BlogPostRenderingTests(TestCase):
+    def test_save_stores_excerpt_and_html(self):
+        post = BlogPost.objects.create(title='Post', content='First <line>\n\nSecond', author='Mahendra')
+        self.assertEqual(post.excerpt, 'First <line> Second')
+        self.assertEqual(post.content_html, '<p>First &lt;line&gt;</p>\n\n<p>Second</p>')
+
+    def test_detail_renders_stored_html(self):
+        post = BlogPost.objects.create(title='Post', content='Hello\nworld', author='Mahendra')
+        response = self.client.get(reverse('blog_detail', args=[post.id]))
+        self.assertContains(response, '<p>Hello<br>world</p>', html=False)
+
+    def test_backfill_command_renders_stale_rows(self):
+        post = BlogPost.objects.create(title='Post', content='Old', author='Mahendra')
+        BlogPost.objects.filter(pk=post.pk).update(content='New text', excerpt='', content_html='')
+        call_command('backfill_blog_posts', batch_size=1, stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.excerpt, 'New text')
+        self.assertEqual(post.content_html, '<p>New text</p>')
+
+
+@override_settings(ROOT_URLCONF='blog.tests_urls')
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        skill = Skill.objects.create(name='Django', category='framework', proficiency=85, description='Framework')
+        project = Project.objects.create(title='Notes App', description='Notes', short_description='Notes app')
+        project.technologies.add(skill)
+        self.post = BlogPost.objects.create(title='Async Post', content='Served over ASGI', author='Mahendra')
+
+    async def test_async_home_matches_sync_sections(self):
+        response = await self.async_client.get('/')
+        self.assertContains(response, '<div class="skill-name">Django</div>')
+        self.assertContains(response, '<span class="tech-tag">Django</span>')
+        self.assertContains(response, 'Async Post')
+        self.assertNotIn(views.CSRF_TOKEN_PLACEHOLDER, response.content.decode())
+
+    async def test_async_blog_list_and_detail(self):
+        response = await self.async_client.get('/blog/')
+        self.assertContains(response, 'Served over ASGI')
+        response = await self.async_client.get(f'/blog/{self.post.id}/')
+        self.assertContains(response, '<p>Served over ASGI</p>')
+        response = await self.async_client.get('/blog/999999/')
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.post = BlogPost.objects.create(title='Post', content='Body', author='Mahendra')
+
+    def test_matching_etag_returns_304_without_queries(self):
+        url = reverse('blog_detail', args=[self.post.id])
+        response = self.client.get(url)
+        self.assertTrue(response.has_header('Last-Modified'))
+        with self.assertNumQueries(0):
+            response = self.client.get(url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_changes_validators(self):
+        url = reverse('blog-list')
+        etag = self.client.get(url)['ETag']
+        self.post.title = 'Edited'
+        self.post.save()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertContains(response, 'Edited')
+
+    def test_list_deletes_change_validators(self):
+        older = BlogPost.objects.create(title='Older', content='Body', author='Mahendra')
+        BlogPost.objects.filter(pk=older.pk).update(updated_on=timezone.now() - timedelta(days=1))
+        cache.clear()
+        url = reverse('blog-list')
+        response = self.client.get(url)
+        self.assertFalse(response.has_header('Last-Modified'))
+        older.delete()
+        response = self.client.get(url, headers={'If-None-Match': response['ETag']})
+        self.assertNotContains(response, 'Older')
+
+    def test_if_modified_since(self):
+        url = reverse('blog_detail', args=[self.post.id])
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_post_is_still_404(self):
+        response = self.client.get(reverse('blog_detail', args=[999999]), headers={'If-None-Match': '*'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_home_etag_is_tied_to_csrf_cookie(self):
+        self.client.get(reverse('index'))
+        etag = self.client.get(reverse('index'))['ETag']
+        self.assertEqual(self.client.get(reverse('index'), headers={'If-None-Match': etag}).status_code, 304)
+
+        self.client.cookies[settings.CSRF_COOKIE_NAME] = 'x' * 32
+        self.assertEqual(self.client.get(reverse('index'), headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_home_with_pending_messages_is_rendered(self):
+        self.client.get(reverse('index'))
+        etag = self.client.get(reverse('index'))['ETag']
+        self.client.cookies['messages'] = 'pending'
+        self.assertEqual(self.client.get(reverse('index'), headers={'If-None-Match': etag}).status_code, 200)
+
+    @override_settings(ROOT_URLCONF='blog.tests_urls')
+    async def test_async_views_return_304(self):
+        url = f'/blog/{self.post.id}/'
+        etag = (await self.async_client.get(url))['ETag']
+        response = await self.async_client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+
+@override_settings(CONTACT_RATE_LIMIT_PER_IP=(3, 60), CONTACT_RATE_LIMIT_GLOBAL=(5, 60))
+class ContactRateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches['ratelimit'].clear()
+
+    def post(self, ip):
+        return self.client.post(reverse('index'), {
+            'name': 'Bot',
+            'email': 'bot@example.com',
+            'subject': 'Spam',
+            'message': 'Buy cheap followers now',
+        }, REMOTE_ADDR=ip)
+
+    def test_burst_from_one_ip_is_bounded(self):
+        statuses = [self.post('10.0.0.1').status_code for _ in range(20)]
+        self.assertEqual(statuses.count(302), 3)
+        self.assertEqual(ContactMessage.objects.count(), 3)
+
+        # Rejected before the form or the database is touched
+        with self.assertNumQueries(0):
+            response = self.post('10.0.0.1')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+
+    def test_burst_from_many_ips_hits_global_limit(self):
+        for i in range(20):
+            self.post(f'10.0.1.{i}')
+        self.assertEqual(ContactMessage.objects.count(), 5)
+
+    def test_global_rejection_keeps_the_ip_token(self):
+        for i in range(5):
+            self.post(f'10.0.1.{i}')
+        self.assertEqual(self.post('10.0.2.1').status_code, 429)
+        # Once the global bucket refills, the rejected IP still has its full burst
+        caches['ratelimit'].delete('ratelimit:contact:global')
+        statuses = [self.post('10.0.2.1').status_code for _ in range(4)]
+        self.assertEqual(statuses, [302, 302, 302, 429])
+
+    def test_bucket_refills_over_time(self):
+        for _ in range(3):
+            self.assertEqual(take_token('test', 3, 60, now=0), 0)
+        self.assertEqual(take_token('test', 3, 60, now=0), 20)
+        self.assertEqual(take_token('test', 3, 60, now=20), 0)
+        self.assertGreater(take_token('test', 3, 60, now=20), 0)
+
+
+class QueryCountMiddlewareTests(TestCase):
+    def setUp(self):
+        self.post = BlogPost.objects.create(title='Post', content='Body', author='Mahendra')
+
+    def test_server_timing_header_reports_queries(self):
+        response = self.client.get(reverse('blog_detail', args=[self.post.id]))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[0-9.]+;desc="2 queries"$')  # validators + post
+
+    @override_settings(QUERY_BUDGET={'blog_detail': 0}, QUERY_BUDGET_RAISE=True)
+    def test_going_over_budget_fails_when_strict(self):
+        with self.assertLogs('portfolio.queries', 'WARNING'), self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse('blog_detail', args=[self.post.id]))
+
+    @override_settings(ROOT_URLCONF='blog.tests_urls', QUERY_DUPLICATE_THRESHOLD=3)
+    def test_repeated_statements_are_flagged(self):
+        for i in range(3):
+            Project.objects.create(title=f'Project {i}', description='D', short_description='S')
+        with self.assertLogs('portfolio.queries', 'WARNING') as logs:
+            self.client.get('/n-plus-one/')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(list(record['duplicates'].values()), [3])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Full-text search uses SQLite FTS5')
+class SearchTests(TestCase):
+    def setUp(self):
+        self.post = BlogPost.objects.create(title='Caching Django views', content='Versioned keys make <b>invalidation</b> cheap.', author='Mahendra')
+        self.project = Project.objects.create(
+            title='Notes App', description='Built with Django', short_description='Note taking',
+            key_features='Fast caching layer', github_url='https://github.com/example/notes',
+        )
+
+    def test_search_ranks_and_highlights_matches(self):
+        response = self.client.get(reverse('search'), {'q': 'cach'})
+        results = response.context['results']
+        self.assertEqual([result.kind for result in results], ['post', 'project'])
+        self.assertEqual(results[1].url, 'https://github.com/example/notes')
+        self.assertContains(response, '<mark>Caching</mark>')
+
+    def test_snippets_escape_content(self):
+        results = search('invalidation')
+        self.assertIn('&lt;b&gt;<mark>invalidation</mark>&lt;/b&gt;', results[0].snippet)
+
+    def test_index_follows_updates_and_deletes(self):
+        BlogPost.objects.filter(pk=self.post.pk).update(title='Indexing with FTS5')
+        self.assertEqual([r.title for r in search('fts5')], ['Indexing with FTS5'])
+        self.post.delete()
+        self.assertEqual(search('fts5'), [])
+
+    def trigger_names(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_every_index_has_its_triggers_after_migrating(self):
+        triggers = self.trigger_names()
+        for index in SEARCH_INDEXES.values():
+            for suffix in ('ai', 'ad', 'au'):
+                self.assertIn(f'{index.table}_{suffix}', triggers)
+
+    def test_migrate_restores_dropped_triggers(self):
+        # What SQLite does when a migration remakes the table
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER blog_blogpost_fts_ai')
+        post = BlogPost.objects.create(title='Written while unindexed', content='Body', author='Mahendra')
+        self.assertEqual(search('unindexed'), [])
+
+        call_command('migrate', verbosity=0)
+        self.assertIn('blog_blogpost_fts_ai', self.trigger_names())
+        self.assertEqual([r.object_id for r in search('unindexed')], [post.pk])
+
+    def test_rebuild_command(self):
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(len(search('django')), 2)
+
+    def test_admin_search_uses_index(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('admin:app_project_changelist'), {'q': 'caching'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.project])
+
+    def test_admin_search_covers_fields_outside_the_index(self):
+        BlogPost.objects.create(title='Unrelated', content='Nothing here', author='Grace Hopper')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        response = self.client.get(reverse('admin:blog_blogpost_changelist'), {'q': 'hopper'})
+        self.assertEqual([post.title for post in response.context['cl'].result_list], ['Unrelated'])
+
+
+# Seeds a file database and exports it with worker processes, which cannot
+# reach the in-memory test database
+PARALLEL_EXPORT = """
+import sys
+import django
+django.setup()
+from django.core.management import call_command
+from blog.models import BlogPost
+call_command('migrate', verbosity=0)
+for i in range(4):
+    BlogPost.objects.create(title=f'Parallel Post {i}', content='Body', author='Mahendra')
+call_command('export_static', sys.argv[1], jobs=2, chunk_size=1)
+"""
+
+
+def model_label():
+    """Runs in a pool worker; needs the app registry"""
+    from django.apps import apps
+    return apps.get_model('blog', 'BlogPost')._meta.label
+
+
+class ExportStaticTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output)
+        self.post = BlogPost.objects.create(title='Exported Post', content='Body', author='Mahendra')
+
+    def export(self):
+        out = StringIO()
+        call_command('export_static', self.output, jobs=1, stdout=out)
+        return out.getvalue()
+
+    def read(self, *parts):
+        with open(os.path.join(self.output, *parts, 'index.html')) as f:
+            return f.read()
+
+    def test_exports_pages_with_fingerprinted_css(self):
+        self.export()
+        home = self.read()
+        self.assertIn('Exported Post', home)
+        self.assertIn('Exported Post', self.read('blog', str(self.post.pk)))
+        css = re.search(r'/static/(css/style\.\w+\.css)"', home).group(1)
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'static', css)))
+
+    def test_exported_contact_form_posts(self):
+        self.export()
+        token = re.search(r'name="csrfmiddlewaretoken" value="([^"]*)"', self.read()).group(1)
+        self.assertEqual(token, '')
+
+        # What the page's script does before the visitor submits
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(reverse('csrf-token'))
+        self.assertIn('no-cache', response['Cache-Control'])
+        response = client.post(reverse('index'), {
+            'csrfmiddlewaretoken': response.json()['token'],
+            'name': 'Visitor',
+            'email': 'visitor@example.com',
+            'subject': 'Hello',
+            'message': 'I found your exported site.',
+        })
+        self.assertRedirects(response, '/#contact', fetch_redirect_response=False)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    @override_settings(SITEMAP_PAGE_SIZE=1)
+    def test_exports_feed_and_sitemaps(self):
+        second = BlogPost.objects.create(title='Second Post', content='Body', author='Mahendra')
+        self.export()
+        self.assertIn('href="/blog/feed/"', self.read())
+        with open(os.path.join(self.output, 'blog', 'feed', 'index.xml')) as f:
+            self.assertIn('<title>Second Post</title>', f.read())
+        with open(os.path.join(self.output, 'sitemap.xml')) as f:
+            self.assertIn('/sitemap-2.xml</loc>', f.read())
+        with open(os.path.join(self.output, 'sitemap-2.xml')) as f:
+            self.assertIn(f'/blog/{second.pk}/</loc>', f.read())
+
+        second.delete()
+        self.export()
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'sitemap-2.xml')))
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'sitemap-1.xml')))
+
+    def test_parallel_export(self):
+        site = os.path.join(self.output, 'site')
+        env = dict(
+            os.environ, PORTFOLIO_DB_NAME=os.path.join(self.output, 'db.sqlite3'),
+            DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE,
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', PARALLEL_EXPORT, site], env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        posts = [name for name in os.listdir(os.path.join(site, 'blog')) if name.isdigit()]
+        self.assertEqual(len(posts), 4)
+        with open(os.path.join(site, 'blog', posts[0], 'index.html')) as f:
+            self.assertIn('Parallel Post', f.read())
+
+    def test_spawned_workers_set_django_up(self):
+        # What platforms without fork, such as Windows, fall back to
+        with mock.patch('multiprocessing.get_all_start_methods', return_value=['spawn']):
+            with process_pool(1) as pool:
+                self.assertEqual(pool.submit(model_label).result(), 'blog.BlogPost')
+
+    def test_incremental_export_only_renders_changed_pages(self):
+        self.export()
+        self.assertIn('Rendered 0 of', self.export())
+
+        self.post.title = 'Renamed Post'
+        self.post.save()
+        # The home page, the blog list, the post, the feed and the sitemap page
+        self.assertIn('Rendered 5 of', self.export())
+        self.assertIn('Renamed Post', self.read('blog', str(self.post.pk)))
+
+
+class StaticPipelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Brotli at quality 11 over the admin's assets takes seconds, so
+        # collect once; the tests only read the output
+        cls.static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        settings_override = override_settings(STATIC_ROOT=cls.static_root)
+        settings_override.enable()
+        cls.addClassCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_css_is_minified_hashed_and_precompressed(self):
+        url = static('css/style.css')
+        self.assertRegex(url, r'^/static/css/style\.[0-9a-f]{12}\.css$')
+        with staticfiles_storage.open(url[len('/static/'):]) as f:
+            css = f.read()
+        self.assertNotIn(b'/*', css)
+        with open(os.path.join(settings.BASE_DIR, 'static', 'css', 'style.css'), 'rb') as f:
+            self.assertLess(len(css), len(f.read()))
+
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), css)
+
+    def test_brotli_copies_are_written_and_served(self):
+        url = static('css/style.css')
+        name = url[len('/static/'):]
+        self.assertTrue(staticfiles_storage.exists(name + '.br'))
+        with staticfiles_storage.open(name) as f:
+            css = f.read()
+
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip, deflate, br'})
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(b''.join(response.streaming_content)), css)
+
+    def test_hashed_names_are_indexed_when_the_manifest_loads(self):
+        name = static('css/style.css')[len('/static/'):]
+        self.assertIn(name, CompressedManifestStaticFilesStorage().hashed_names)
+        self.assertNotIn('css/style.css', staticfiles_storage.hashed_names)
+
+    def test_plain_and_unhashed_files(self):
+        response = self.client.get('/static/css/style.css')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Cache-Control'], f'public, max-age={settings.STATIC_MAX_AGE}')
+        self.assertEqual(self.client.get('/static/css/missing.css').status_code, 404)
+
+    def test_pages_link_hashed_stylesheet(self):
+        self.assertContains(self.client.get(reverse('blog-list')), static('css/style.css'))
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_pages_are_gzipped_when_accepted(self):
+        response = self.client.get(reverse('index'), headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertIn(b'id="contact"', gzip.decompress(response.content))
+
+        self.assertFalse(self.client.get(reverse('index')).has_header('Content-Encoding'))
+
+    def test_pages_use_brotli_when_accepted(self):
+        response = self.client.get(reverse('index'), headers={'Accept-Encoding': 'gzip, deflate, br'})
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertIn(b'id="contact"', brotli.decompress(response.content))
+
+    @override_settings(ROOT_URLCONF='blog.tests_urls')
+    def test_streaming_responses_use_brotli_when_accepted(self):
+        response = self.client.get('/stream/', headers={'Accept-Encoding': 'br'})
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(b''.join(response.streaming_content)).count(b'line'), 500)
+
+    @override_settings(ROOT_URLCONF='blog.tests_urls')
+    def test_small_and_streaming_responses(self):
+        Project.objects.create(title='Project', description='D', short_description='S')
+        response = self.client.get('/n-plus-one/', headers={'Accept-Encoding': 'gzip'})
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.client.get('/stream/', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)).count(b'line'), 500)
+
+    def test_templates_are_minified_once_loaded(self):
+        content = self.client.get(reverse('blog-list')).content.decode()
+        markup = content.split('<script>')[0]
+        self.assertIn('<h1 class="section-title">Latest Insights</h1>', markup)
+        self.assertNotIn('\n', markup)
+
+    def test_minify_html_keeps_whitespace_sensitive_blocks(self):
+        html = '<p>\n  a   b\n</p>\n<pre>x\n  y</pre>\n<script>\n// note\nrun();\n</script>'
+        self.assertEqual(minify_html(html), '<p> a b </p> <pre>x\n  y</pre> <script>\n// note\nrun();\n</script>')
+
+    def test_minify_css_keeps_selector_spaces(self):
+        css = 'a :hover,\n.nav > li :first-child {\n  color : red;\n  --gap:  2px;\n}\n@media (min-width: 600px) { p { margin: 0 } }'
+        self.assertEqual(
+            minify_css(css),
+            'a :hover,.nav>li :first-child{color:red;--gap:2px}@media (min-width:600px){p{margin:0}}',
+        )
+
+
+class SitemapFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(5):
+            BlogPost.objects.create(title=f'Post {i} & more', content='Body', author='Mahendra')
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        if response.streaming:
+            return b''.join(response.streaming_content).decode()
+        return response.content.decode()
+
+    def test_sitemap_lists_pages_and_every_post(self):
+        index = self.get(reverse('sitemap'))
+        self.assertIn('<loc>http://testserver/sitemap-1.xml</loc>', index)
+        body = self.get(reverse('sitemap-page', args=[1]))
+        self.assertIn('<loc>http://testserver/blog/</loc>', body)
+        for post in BlogPost.objects.all():
+            self.assertIn(f'<loc>http://testserver/blog/{post.pk}/</loc>', body)
+
+    @override_settings(SITEMAP_PAGE_SIZE=3, FEED_CHUNK_SIZE=2)
+    def test_sitemap_pages_are_cached_in_chunks_and_resume(self):
+        self.assertEqual(self.get(reverse('sitemap')).count('<sitemap>'), 2)
+        first = self.get(reverse('sitemap-page', args=[1]))
+        second = self.get(reverse('sitemap-page', args=[2]))
+        self.assertEqual((first.count('/blog/'), second.count('/blog/')), (4, 2))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(reverse('sitemap-page', args=[2])), second)
+        # Losing a later chunk only re-reads the rows after the cached ones
+        cache.delete(feeds.cache_key(RequestFactory().get('/'), 'sitemap-1') + ':1')
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.get(reverse('sitemap-page', args=[1])), first)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn('"id" >', ctx.captured_queries[0]['sql'])
+
+    def test_feed_is_cached_until_a_post_changes(self):
+        feed = self.get(reverse('blog-feed'))
+        self.assertIn('<title>Post 4 &amp; more</title>', feed)
+        self.assertLess(feed.index('Post 4'), feed.index('Post 0'))
+        with self.assertNumQueries(0):
+            self.get(reverse('blog-feed'))
+
+        # Skill edits leave the feed alone; post edits refresh it
+        Skill.objects.create(name='Go', category='programming', proficiency=40, description='D')
+        with self.assertNumQueries(0):
+            self.get(reverse('blog-feed'))
+        BlogPost.objects.create(title='Fresh', content='Body', author='Mahendra')
+        self.assertIn('Fresh', self.get(reverse('blog-feed')))
+
+
+class HomepageSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.django = Skill.objects.create(name='Django', category='framework', proficiency=85, description='Framework')
+        project = Project.objects.create(title='Notes App', description='Notes', short_description='Notes app', tech_tags='Python')
+        project.technologies.add(self.django)
+        BlogPost.objects.create(title='Snapshot Post', content='Body', author='Mahendra')
+
+    def test_home_page_miss_reads_one_row(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('index'))
+        self.assertContains(response, '<span class="tech-tag">Django</span>')
+        self.assertContains(response, 'Snapshot Post')
+
+    def test_built_by_migrate(self):
+        HomepageSnapshot.objects.all().delete()
+        call_command('migrate', verbosity=0)
+        with self.assertNumQueries(1):
+            sections = get_home_sections()
+        self.assertEqual([post.title for post in sections['recent_posts']], ['Snapshot Post'])
+
+    def test_sections_rehydrate_like_model_rows(self):
+        sections = get_home_sections()
+        post = sections['recent_posts'][0]
+        self.assertEqual(post.created_on, BlogPost.objects.get().created_on)
+        self.assertEqual(post.get_deferred_fields(), {'content', 'content_html', 'updated_on', 'seed_key'})
+        with self.assertNumQueries(0):
+            self.assertEqual(sections['projects'][0].get_tech_list(), ['Django'])
+            self.assertEqual(sections['skills'][0].get_category_display(), 'Frameworks & Libraries')
+
+    def test_stored_key_order_does_not_matter(self):
+        # As jsonb on PostgreSQL returns them: not in insertion order
+        data = HomepageSnapshot.objects.get().data
+        for rows in data.values():
+            for row in rows:
+                row['fields'] = dict(reversed(row['fields'].items()))
+        sections = load_sections(data)
+        skill = sections['skills'][0]
+        self.assertEqual((skill.name, skill.category, skill.proficiency), ('Django', 'framework', 85))
+        self.assertEqual(sections['recent_posts'][0].title, 'Snapshot Post')
+        self.assertEqual(sections['recent_posts'][0].get_deferred_fields(), {'content', 'content_html', 'updated_on', 'seed_key'})
+
+    def test_rebuilt_once_when_the_transaction_commits(self):
+        BlogPost.objects.bulk_create([BlogPost(title=f'Bulk {i}', content='Body', author='Mahendra') for i in range(5)])
+        with mock.patch('blog.signals.rebuild_snapshot', wraps=rebuild_snapshot) as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    BlogPost.objects.all().delete()
+                    Skill.objects.create(name='Rust', category='programming', proficiency=40, description='Language')
+                    self.assertEqual(rebuild.call_count, 0)
+        self.assertEqual(rebuild.call_count, 1)
+        sections = get_home_sections()
+        self.assertEqual(sections['recent_posts'], [])
+        self.assertIn('Rust', [skill.name for skill in sections['skills']])
+
+    def test_rolled_back_changes_are_not_rebuilt(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    Skill.objects.create(name='Rust', category='programming', proficiency=40, description='Language')
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertNotIn('Rust', [skill.name for skill in get_home_sections()['skills']])
+
+        # The discarded rebuild does not hold back the next transaction's
+        with self.captureOnCommitCallbacks(execute=True):
+            self.django.delete()
+        self.assertEqual(get_home_sections()['projects'][0].get_tech_list(), ['Python'])
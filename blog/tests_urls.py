@@ -0,0 +1,15 @@
+"""URLconf for blog.tests: the async views under their usual names, plus an N+1 view"""
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import path
+
+from app.models import Project
+from . import feeds, views
+
+urlpatterns = [
+    path('', views.ahome, name='index'),
+    path('blog/', views.ablog_list, name='blog-list'),
+    path('blog/<int:post_id>/', views.ablog_detail, name='blog_detail'),
+    path('blog/feed/', feeds.blog_feed, name='blog-feed'),
+    path('n-plus-one/', lambda request: HttpResponse(str([p.technologies.count() for p in Project.objects.all()]))),
+    path('stream/', lambda request: StreamingHttpResponse(f'line {i}\n' for i in range(500))),
+]
@@ -1,62 +1,126 @@
+import math
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, get_object_or_404
 from django.contrib import messages
-from django.core.mail import send_mail
+from django.core.cache import cache
 from django.conf import settings
+from django.db import transaction
+from django.http import Http404, HttpResponse, JsonResponse
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.views.decorators.cache import never_cache
+from .cache import aversioned_key, versioned_key
+from .conditional import blog_detail_validators, blog_list_validators, conditional_view, home_validators
 from .models import BlogPost
+from .pagination import apaginate_by_cursor, paginate_by_cursor
+from .ratelimit import check_contact_rate
+from .search import search as search_index
+from .snapshot import aget_home_sections, get_home_sections
 from app.forms import ContactForm
-from app.models import ContactMessage
+from app.icons import sprite_version
+from app.models import ContactMessage, OutboundEmail
+
+# Stand-ins rendered into the cached home page and swapped per request
+CSRF_TOKEN_PLACEHOLDER = 'csrftokenplaceholder'
+CONTACT_MESSAGES_PLACEHOLDER = '<!-- contact-messages -->'
 
+@conditional_view(home_validators, per_visitor=True)
 def home(request):
-    # Import app models
-    from app.models import Skill, Project, Achievement, Experience
-    
     # Handle contact form submission
     if request.method == 'POST':
+        # Refuse floods before validating or writing anything
+        wait = check_contact_rate(get_client_ip(request))
+        if wait:
+            response = HttpResponse('Too many messages. Please try again later.', status=429, content_type='text/plain')
+            response['Retry-After'] = str(math.ceil(wait))
+            return response
+        
         form = ContactForm(request.POST)
         if form.is_valid():
             # Save the contact message
             contact_message = form.save(commit=False)
             contact_message.ip_address = get_client_ip(request)
             contact_message.user_agent = request.META.get('HTTP_USER_AGENT', '')
-            contact_message.save()
-            
-            # Send email notification
-            try:
-                send_contact_email(contact_message)
-                messages.success(request, 'Thank you for your message! I\'ll get back to you soon.')
-            except Exception as e:
-                messages.warning(request, 'Your message was saved, but there was an issue sending the email notification.')
+            # Queue the notifications in the same transaction; send_outbox delivers them
+            with transaction.atomic():
+                contact_message.save()
+                queue_contact_emails(contact_message)
+            messages.success(request, 'Thank you for your message! I\'ll get back to you soon.')
             
             # Redirect to prevent form resubmission
             from django.http import HttpResponseRedirect
             return HttpResponseRedirect('/#contact')
         else:
             messages.error(request, 'Please correct the errors below.')
-    else:
-        form = ContactForm()
+            # A bound form with errors is specific to this request, so skip the cache
+            context = get_home_context(form)
+            context['contact_messages'] = render_contact_messages(request)
+            return render(request, 'index.html', context)
     
-    # Get featured content for the home page
-    skills = Skill.objects.filter(is_featured=True)
-    projects = Project.objects.filter(is_featured=True)
-    achievements = Achievement.objects.filter(is_featured=True)[:3]
-    experiences = Experience.objects.filter(is_featured=True)[:2]
+    # The unbound page only changes when portfolio content or the icon sprite
+    # changes; the sprite is a file, so other processes see a rebuild too
+    cache_key = versioned_key(f'home:{sprite_version()}')
+    body = cache.get(cache_key)
+    if body is None:
+        body = render_cached_home(request, get_home_context(ContactForm()))
+        cache.set(cache_key, body, settings.PAGE_CACHE_TIMEOUT)
     
-    # Get recent blog posts
-    try:
-        recent_posts = BlogPost.objects.order_by('-created_on')[:3]
-    except:
-        recent_posts = []
+    return HttpResponse(fill_home_fragments(body, request, render_contact_messages(request)))
+
+@conditional_view(home_validators, per_visitor=True)
+async def ahome(request):
+    """Async version of home() for ASGI deployments"""
+    if request.method == 'POST':
+        # Saving the message and queueing its emails is one sync transaction
+        return await sync_to_async(home)(request)
     
-    context = {
-        'skills': skills,
-        'projects': projects,
-        'achievements': achievements,
-        'experiences': experiences,
-        'recent_posts': recent_posts,
+    cache_key = await aversioned_key(f'home:{sprite_version()}')
+    body = await cache.aget(cache_key)
+    if body is None:
+        context = get_home_context(ContactForm(), await aget_home_sections())
+        body = render_cached_home(request, context)
+        await cache.aset(cache_key, body, settings.PAGE_CACHE_TIMEOUT)
+    
+    # Message storage may fall back to the session, which is sync-only
+    contact_messages = await sync_to_async(render_contact_messages)(request)
+    return HttpResponse(fill_home_fragments(body, request, contact_messages))
+
+def get_home_context(form, sections=None):
+    """Build the template context for the home page"""
+    # The featured content comes from the denormalized snapshot, one row
+    if sections is None:
+        sections = get_home_sections()
+    
+    return {
+        **sections,
         'contact_form': form,
+        # Skill and project cards are cached per row, keyed on updated_at
+        'fragment_cache_timeout': settings.PAGE_CACHE_TIMEOUT,
+        'icon_sprite_version': sprite_version(),
     }
-    
-    return render(request, 'index.html', context)
+
+def render_cached_home(request, context):
+    """Render the home page with placeholders for the per-request fragments"""
+    context['csrf_token'] = CSRF_TOKEN_PLACEHOLDER
+    context['contact_messages'] = mark_safe(CONTACT_MESSAGES_PLACEHOLDER)
+    return render_to_string('index.html', context, request=request)
+
+def fill_home_fragments(body, request, contact_messages):
+    """Swap this request's CSRF token and flash messages into a cached page"""
+    # Matching on the quoted attribute means escaped user content can never collide
+    body = body.replace(f'value="{CSRF_TOKEN_PLACEHOLDER}"', f'value="{get_token(request)}"', 1)
+    return body.replace(CONTACT_MESSAGES_PLACEHOLDER, contact_messages, 1)
+
+def render_contact_messages(request):
+    """Render the flash messages shown above the contact form"""
+    return render_to_string('contact_messages.html', request=request)
+
+@never_cache
+def csrf_token(request):
+    """Hand a CSRF token, and its cookie, to pages exported without one"""
+    return JsonResponse({'token': get_token(request)})
 
 def get_client_ip(request):
     """Get the client IP address from the request"""
@@ -67,8 +131,8 @@ def get_client_ip(request):
         ip = request.META.get('REMOTE_ADDR')
     return ip
 
-def send_contact_email(contact_message):
-    """Send email notification when a contact form is submitted"""
+def queue_contact_emails(contact_message):
+    """Queue the notification and confirmation emails for a contact form submission"""
     subject = f'New Contact Form Submission: {contact_message.subject}'
     
     message_body = f"""
@@ -87,16 +151,7 @@ def send_contact_email(contact_message):
     IP Address: {contact_message.ip_address}
     """
     
-    # Send email to you
-    send_mail(
-        subject=subject,
-        message=message_body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[settings.CONTACT_EMAIL],
-        fail_silently=False,
-    )
-    
-    # Send confirmation email to the sender
+    # Confirmation email to the sender
     confirmation_subject = f'Thank you for contacting Mahendra Dhakal'
     confirmation_message = f"""
     Hello {contact_message.name},
@@ -113,18 +168,67 @@ def send_contact_email(contact_message):
     +977-9806714549
     """
     
-    send_mail(
-        subject=confirmation_subject,
-        message=confirmation_message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[contact_message.email],
-        fail_silently=True,  # Don't fail if confirmation email fails
-    )
+    OutboundEmail.objects.bulk_create([
+        # Notification to you
+        OutboundEmail(
+            contact_message=contact_message,
+            subject=subject,
+            body=message_body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient=settings.CONTACT_EMAIL,
+        ),
+        # Confirmation to the sender
+        OutboundEmail(
+            contact_message=contact_message,
+            subject=confirmation_subject,
+            body=confirmation_message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient=contact_message.email,
+        ),
+    ])
 
+@conditional_view(blog_list_validators)
 def blog_list(request):
-    posts = BlogPost.objects.all().order_by('-created_on')
-    return render(request, 'list.html', {'posts': posts})
+    cursor = request.GET.get('cursor')
+    # Only the columns shown on the cards, never the full content
+    posts = BlogPost.objects.only('id', 'title', 'author', 'created_on', 'excerpt')
+    posts, next_cursor = paginate_by_cursor(posts, cursor, settings.BLOG_PAGE_SIZE)
+    context = {
+        'posts': posts,
+        'next_cursor': next_cursor,
+        'is_first_page': not cursor,
+    }
+    return render(request, 'list.html', context)
 
+@conditional_view(blog_list_validators)
+async def ablog_list(request):
+    """Async version of blog_list()"""
+    cursor = request.GET.get('cursor')
+    posts = BlogPost.objects.only('id', 'title', 'author', 'created_on', 'excerpt')
+    posts, next_cursor = await apaginate_by_cursor(posts, cursor, settings.BLOG_PAGE_SIZE)
+    context = {
+        'posts': posts,
+        'next_cursor': next_cursor,
+        'is_first_page': not cursor,
+    }
+    return render(request, 'list.html', context)
+
+@conditional_view(blog_detail_validators)
 def blog_detail(request, post_id):
-    post = get_object_or_404(BlogPost, id=post_id)
+    # The raw content is only needed to build the stored HTML, not to show it
+    post = get_object_or_404(BlogPost.objects.defer('content'), id=post_id)
+    return render(request, 'details.html', {'post': post})
+
+def search(request):
+    query = request.GET.get('q', '').strip()[:200]
+    results = search_index(query) if query else []
+    return render(request, 'search.html', {'query': query, 'results': results})
+
+@conditional_view(blog_detail_validators)
+async def ablog_detail(request, post_id):
+    """Async version of blog_detail()"""
+    try:
+        post = await BlogPost.objects.defer('content').aget(id=post_id)
+    except BlogPost.DoesNotExist:
+        raise Http404('No BlogPost matches the given query.')
     return render(request, 'details.html', {'post': post})
\ No newline at end of file
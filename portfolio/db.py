@@ -0,0 +1,11 @@
+"""Database connection setup."""
+from django.conf import settings
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Apply settings.SQLITE_PRAGMAS to each new SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+    # The raw DB-API connection keeps these out of query logging and budgets
+    for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+        connection.connection.execute(f'PRAGMA {pragma} = {value}')
@@ -0,0 +1,21 @@
+"""Template loaders."""
+from django.conf import settings
+from django.template.loaders import cached
+
+from .minify import minify_html
+
+
+class MinifyingLoader(cached.Loader):
+    """Cached loader that minifies the project's .html templates before compiling.
+
+    Whitespace is collapsed once per template rather than once per
+    response, so every render, and every page cache entry built from
+    one, is already minified. Templates from installed packages (e.g.
+    admin) are left alone.
+    """
+
+    def get_contents(self, origin):
+        contents = super().get_contents(origin)
+        if origin.name.endswith('.html') and origin.name.startswith(str(settings.BASE_DIR)):
+            return minify_html(contents)
+        return contents
@@ -0,0 +1,208 @@
+"""Project-wide middleware."""
+import json
+import logging
+import mimetypes
+import os
+import re
+import time
+from collections import Counter
+
+import brotli
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.db import connection
+from django.http import FileResponse, HttpResponseNotModified
+from django.middleware.gzip import GZipMiddleware
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+logger = logging.getLogger('portfolio.queries')
+
+
+class QueryBudgetExceeded(Exception):
+    """A view ran more queries than settings.QUERY_BUDGET allows"""
+
+
+class QueryStats:
+    """Execute wrapper that records how many queries ran and for how long"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            # The SQL still has its placeholders, so repeats with different
+            # parameters (the N+1 pattern) count as the same statement
+            self.statements[sql] += 1
+
+    def duplicates(self, threshold):
+        return {sql: count for sql, count in self.statements.items() if count >= threshold}
+
+
+class QueryCountMiddleware:
+    """Count the SQL queries and database time of every request.
+
+    Adds a Server-Timing header, logs a JSON line to ``portfolio.queries``,
+    and flags statements repeated QUERY_DUPLICATE_THRESHOLD times or more.
+    With QUERY_BUDGET_RAISE enabled (e.g. in tests), going over QUERY_BUDGET
+    raises QueryBudgetExceeded instead of only logging a warning.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        with connection.execute_wrapper(stats):
+            response = self.get_response(request)
+
+        duplicates = stats.duplicates(getattr(settings, 'QUERY_DUPLICATE_THRESHOLD', 3))
+        budget = self.get_budget(request)
+        over_budget = budget is not None and stats.count > budget
+
+        response['Server-Timing'] = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_ms': round(stats.duration * 1000, 2),
+            'duplicates': duplicates,
+            'budget': budget,
+        }
+        level = logging.WARNING if duplicates or over_budget else logging.INFO
+        logger.log(level, json.dumps(record))
+
+        if over_budget and getattr(settings, 'QUERY_BUDGET_RAISE', False):
+            raise QueryBudgetExceeded(f'{request.path} ran {stats.count} queries, budget is {budget}')
+        return response
+
+    def get_budget(self, request):
+        """QUERY_BUDGET is either one limit or a dict keyed by URL name"""
+        budget = getattr(settings, 'QUERY_BUDGET', None)
+        if isinstance(budget, dict):
+            url_name = request.resolver_match.url_name if request.resolver_match else None
+            return budget.get(url_name, budget.get('default'))
+        return budget
+
+
+class StaticFilesMiddleware:
+    """Serve collected static files for deployments without a front-end server.
+
+    Picks the precompressed .br or .gz sibling the client accepts, marks
+    hashed (manifest) names as immutable, and returns a FileResponse so
+    the WSGI server can use wsgi.file_wrapper (sendfile). Requests for
+    files that are not in STATIC_ROOT fall through to the rest of the stack.
+    """
+    ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SERVE_STATIC', False) or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path.startswith(self.prefix):
+            response = self.serve(request, request.path[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        stat = os.stat(path)
+        if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+            return HttpResponseNotModified()
+
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        encoding = None
+        for candidate, suffix in self.ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                encoding, path = candidate, path + suffix
+                break
+
+        response = FileResponse(open(path, 'rb'), content_type=content_type, filename=os.path.basename(name))
+        if encoding:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ['Accept-Encoding'])
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if self.is_hashed(name):
+            response['Cache-Control'] = 'public, max-age=31536000, immutable'
+        else:
+            response['Cache-Control'] = f'public, max-age={settings.STATIC_MAX_AGE}'
+        return response
+
+    def is_hashed(self, name):
+        return name in getattr(staticfiles_storage, 'hashed_names', ())
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Compress text responses with brotli when the client accepts it, otherwise gzip.
+
+    Responses under COMPRESS_MIN_SIZE bytes, already encoded ones and
+    FileResponses (left to sendfile) pass through unchanged. Streaming
+    responses are compressed chunk by chunk.
+    """
+    COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'application/rss+xml', 'image/svg+xml')
+
+    def process_response(self, request, response):
+        if isinstance(response, FileResponse) or response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith(self.COMPRESSIBLE_TYPES):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESS_MIN_SIZE:
+            return response
+
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if not re.search(r'\bbr\b', accepted):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ['Accept-Encoding'])
+        if response.streaming:
+            response.streaming_content = self.brotli_stream(response)
+            del response.headers['Content-Length']
+        else:
+            compressed = brotli.compress(response.content, quality=5)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+    def brotli_stream(self, response):
+        compressor = brotli.Compressor(quality=5)
+        chunks = response.streaming_content
+        if response.is_async:
+            async def compress():
+                async for chunk in chunks:
+                    yield compressor.process(chunk) + compressor.flush()
+                yield compressor.finish()
+        else:
+            def compress():
+                for chunk in chunks:
+                    yield compressor.process(chunk) + compressor.flush()
+                yield compressor.finish()
+        return compress()
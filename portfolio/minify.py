@@ -0,0 +1,35 @@
+"""Whitespace and comment stripping for CSS and HTML."""
+import re
+
+# Quoted strings are copied through untouched
+CSS_STRING = re.compile(r'''("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')''')
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+CSS_SPACE_AROUND = re.compile(r'\s*([{};,>])\s*')
+# Only after a property or media feature name, so selectors keep their spaces
+CSS_SPACE_AFTER = re.compile(r'(?<=[{;(])\s*([-\w]+)\s*:\s+')
+
+
+def minify_css(css):
+    """Drop comments and redundant whitespace, leaving strings unchanged"""
+    parts = CSS_STRING.split(css)
+    for i in range(0, len(parts), 2):
+        code = CSS_COMMENT.sub('', parts[i])
+        code = re.sub(r'\s+', ' ', code)
+        code = CSS_SPACE_AROUND.sub(r'\1', code)
+        parts[i] = CSS_SPACE_AFTER.sub(r'\1:', code).replace(';}', '}')
+    return ''.join(parts).strip()
+
+# Blocks whose whitespace is significant are copied through untouched
+HTML_PRESERVED = re.compile(r'<(pre|textarea|script|style)\b.*?</\1\s*>', re.S | re.I)
+
+
+def minify_html(html):
+    """Collapse whitespace runs to one space outside <pre>, <textarea>, <script> and <style>"""
+    parts = []
+    position = 0
+    for match in HTML_PRESERVED.finditer(html):
+        parts.append(re.sub(r'\s+', ' ', html[position:match.start()]))
+        parts.append(match.group(0))
+        position = match.end()
+    parts.append(re.sub(r'\s+', ' ', html[position:]))
+    return ''.join(parts).strip()
@@ -0,0 +1,71 @@
+"""Admin changelist paginator that avoids COUNT(*) over large tables."""
+from django.conf import settings
+from django.core.paginator import EmptyPage, Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset):
+    """Cheap row count estimate of an unfiltered queryset's table, or None.
+
+    PostgreSQL keeps one in pg_class; on SQLite the largest rowid is an
+    upper bound that stays close for append-mostly tables.
+    """
+    if queryset.query.where or queryset.query.distinct or queryset.query.is_sliced:
+        return None
+    model = queryset.model
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass'
+        params = [model._meta.db_table]
+    elif connection.vendor == 'sqlite':
+        sql = f'SELECT MAX(rowid) FROM {connection.ops.quote_name(model._meta.db_table)}'
+        params = []
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    # reltuples is -1 until the table is first vacuumed or analyzed
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose count is an estimate for unfiltered tables over ADMIN_ESTIMATED_COUNT_THRESHOLD rows.
+
+    Filtered and searched changelists still get an exact count, which
+    the filter's index keeps cheap. An estimate is off after purges (rowids
+    are not reused) or while reltuples lags behind, so any page past the
+    estimated end renders, empty if no rows are left, instead of raising
+    EmptyPage, which the admin turns into its ?e=1 error page.
+    """
+    estimated = False
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is not None and estimate > settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+            self.estimated = True
+            return estimate
+        return super().count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.estimated and int(number) > 1:
+                return int(number)
+            raise
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.estimated:
+            return super().page(number)
+        # Not clamped to the estimate, which may end before the real rows do
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
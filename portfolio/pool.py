@@ -0,0 +1,24 @@
+"""Process pools for the parallel management commands."""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.db import connections
+
+
+def process_pool(max_workers):
+    """A ProcessPoolExecutor whose workers can use the ORM and storage.
+
+    Forked workers inherit the loaded apps and the settings of this process,
+    including any overridden at runtime such as the test database, so fork is
+    used wherever the platform has it, whatever the default start method.
+    Elsewhere workers start from a fresh interpreter and set Django up from
+    DJANGO_SETTINGS_MODULE before their first task.
+    """
+    # Workers must not share this process's database connections
+    connections.close_all()
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=django.setup)
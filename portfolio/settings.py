@@ -44,6 +44,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'portfolio.middleware.StaticFilesMiddleware',
+    'portfolio.middleware.CompressionMiddleware',
+    'portfolio.middleware.QueryCountMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -54,11 +57,22 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'portfolio.urls'
 
+# Route to the async views when serving through portfolio.asgi
+ASYNC_VIEWS = os.environ.get('PORTFOLIO_ASYNC_VIEWS') == '1'
+
+# Collapse whitespace in the project's templates when they are loaded
+# (portfolio.loaders.MinifyingLoader), so cached pages are stored minified
+MINIFY_HTML = os.environ.get('PORTFOLIO_MINIFY_HTML', '1') == '1'
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],  
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -66,6 +80,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            'loaders': [('portfolio.loaders.MinifyingLoader', TEMPLATE_LOADERS)] if MINIFY_HTML else TEMPLATE_LOADERS,
         },
     },
 ]
@@ -75,12 +90,146 @@ WSGI_APPLICATION = 'portfolio.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# PORTFOLIO_DB_ENGINE=postgresql selects PostgreSQL (needs psycopg) using the
+# other PORTFOLIO_DB_* variables; otherwise SQLite at PORTFOLIO_DB_NAME.
+
+DB_ENGINE = os.environ.get('PORTFOLIO_DB_ENGINE', 'sqlite')
+# Seconds to keep a connection open between requests (0 closes it after each)
+DB_CONN_MAX_AGE = int(os.environ.get('PORTFOLIO_DB_CONN_MAX_AGE', '60'))
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('PORTFOLIO_DB_NAME', 'portfolio'),
+            'USER': os.environ.get('PORTFOLIO_DB_USER', 'portfolio'),
+            'PASSWORD': os.environ.get('PORTFOLIO_DB_PASSWORD', ''),
+            'HOST': os.environ.get('PORTFOLIO_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('PORTFOLIO_DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            # Check persistent connections before reuse instead of failing a request
+            'CONN_HEALTH_CHECKS': True,
+            # .iterator() uses server-side cursors, which transaction-pooling
+            # PgBouncer does not support; set PORTFOLIO_DB_PGBOUNCER=1 behind one
+            'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('PORTFOLIO_DB_PGBOUNCER') == '1',
+            'OPTIONS': {
+                'connect_timeout': 5,
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('PORTFOLIO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'OPTIONS': {
+                # Seconds a writer waits for the lock before "database is locked"
+                'timeout': 20,
+                # Take the write lock at BEGIN. A deferred transaction that reads
+                # first cannot wait out the timeout when it upgrades to a write
+                # in WAL mode; SQLite fails it at once instead.
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
 
-DATABASES = {
+# Applied to every new SQLite connection (see portfolio.db). WAL lets reads
+# run alongside the single writer; NORMAL is durable in WAL mode except for
+# the last commits on power loss.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -16000,
+    'temp_store': 'MEMORY',
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Local memory is per process; use a shared backend (Redis, Memcached) when
+# running several workers so content changes invalidate every process.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'portfolio',
+    },
+    # Token buckets for the contact form (see blog.ratelimit)
+    'ratelimit': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'portfolio-ratelimit',
+    },
+}
+
+# Rendered pages are keyed by content version, so this only bounds memory use
+PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+# Number of posts per page on the blog archive
+BLOG_PAGE_SIZE = 10
+
+
+# sitemap.xml and the RSS feed (blog/feeds.py). Sitemap pages are capped at
+# the protocol's 50,000 URLs; posts are read and cached FEED_CHUNK_SIZE at a time.
+SITEMAP_PAGE_SIZE = 50000
+FEED_SIZE = 20
+FEED_CHUNK_SIZE = 2000
+
+
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESS_MIN_SIZE = 500
+
+
+# Contact form flood protection: (burst, seconds to refill the whole burst)
+# per client IP and across all clients. Over-limit POSTs get a 429.
+# The buckets live in CONTACT_RATE_LIMIT_CACHE. The LocMemCache configured
+# above is per process, so each worker has its own buckets and the limits
+# multiply by the worker count; production needs a shared backend there
+# (Redis, Memcached or the database cache).
+
+CONTACT_RATE_LIMIT_PER_IP = (5, 60 * 60)
+CONTACT_RATE_LIMIT_GLOBAL = (50, 60 * 60)
+CONTACT_RATE_LIMIT_CACHE = 'ratelimit'
+
+
+# Admin changelists of unfiltered tables larger than this show an estimated
+# row count (portfolio.paginator.EstimatedCountPaginator) instead of COUNT(*)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 10000
+
+
+# Query instrumentation (see portfolio.middleware.QueryCountMiddleware)
+# QUERY_BUDGET is one limit for every view or a dict keyed by URL name.
+
+QUERY_BUDGET = {
+    # A page cache miss reads the validators and the home page snapshot; the
+    # contact form POST writes the message and its queued emails
+    'index': 4,
+    'blog-list': 2,
+    'blog_detail': 2,
+}
+QUERY_BUDGET_RAISE = False
+QUERY_DUPLICATE_THRESHOLD = 3
+
+
+# Logging
+# Per-request query lines are logged at INFO; set PORTFOLIO_LOG_LEVEL=INFO to see them.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'portfolio': {
+            'handlers': ['console'],
+            'level': os.environ.get('PORTFOLIO_LOG_LEVEL', 'WARNING'),
+        },
+    },
 }
 
 
@@ -124,6 +273,37 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, "static"),
 ]
 
+# collectstatic writes minified, hashed and precompressed files here
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'portfolio.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Skill logo sprite (app/icons.py), a static file built by build_icon_sprite
+ICON_SPRITE = 'icons/skills.svg'
+
+# Uploaded files (Project.image, Experience.company_logo)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Resized copies of uploaded images offered through srcset (app/images.py);
+# formats are listed in order of preference, the last is the <img> fallback
+IMAGE_DERIVATIVE_WIDTHS = [320, 640, 960, 1280]
+IMAGE_DERIVATIVE_FORMATS = ['avif', 'webp', 'jpeg']
+IMAGE_DERIVATIVE_QUALITY = {'avif': 50, 'webp': 75, 'jpeg': 80}
+
+# Serve STATIC_ROOT from Django (portfolio.middleware.StaticFilesMiddleware)
+# when no front-end server does; set PORTFOLIO_SERVE_STATIC=0 behind nginx.
+SERVE_STATIC = os.environ.get('PORTFOLIO_SERVE_STATIC', '1') == '1'
+# Cache lifetime for unhashed names; hashed ones are cached for a year
+STATIC_MAX_AGE = 60 * 60
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -0,0 +1,94 @@
+"""Static files storage: hashed names, minified CSS and precompressed copies.
+
+``collectstatic`` is the build step. It minifies each CSS file, stores it
+under a content-hashed name recorded in staticfiles.json, and writes .gz
+and .br copies next to every text asset for
+portfolio.middleware.StaticFilesMiddleware or nginx's gzip_static and
+brotli_static.
+"""
+import gzip
+
+import brotli
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, StaticFilesStorage
+
+from .minify import minify_css
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.txt', '.html', '.json', '.xml', '.map')
+# Smaller files fit in a packet anyway and may grow when compressed
+COMPRESS_MIN_SIZE = 512
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # Fall back to the plain name for files missing from the manifest
+    manifest_strict = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.index_hashed_names()
+
+    def index_hashed_names(self):
+        # StaticFilesMiddleware checks every request against these
+        self.hashed_names = set(self.hashed_files.values())
+
+    def url(self, name, force=False):
+        try:
+            return super().url(name, force)
+        except ValueError:
+            # Not collected yet (e.g. tests, or a fresh checkout): link the
+            # unhashed name rather than failing the whole page
+            return StaticFilesStorage.url(self, name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run, **options)
+            return
+
+        # Minify the collected copy first, and hash that instead of the
+        # source file, so the content hash matches what gets served
+        for name in paths:
+            if name.endswith('.css'):
+                self.minify(name)
+                paths[name] = (self, name)
+
+        processed_names = set()
+        for original, processed, was_processed in super().post_process(paths, dry_run, **options):
+            yield original, processed, was_processed
+            if processed and not isinstance(was_processed, Exception):
+                processed_names.update([original, processed])
+        self.index_hashed_names()
+
+        for name in sorted(processed_names):
+            for compressed in self.compress(name):
+                yield name, compressed, True
+
+    def minify(self, name):
+        path = self.path(name)
+        with open(path, encoding='utf-8') as f:
+            css = f.read()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(minify_css(css))
+
+    def compress(self, name):
+        """Write precompressed siblings of ``name``; returns their names"""
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return []
+        path = self.path(name)
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return []
+
+        # mtime=0 keeps the output identical between builds
+        variants = {
+            '.gz': gzip.compress(data, compresslevel=9, mtime=0),
+            '.br': brotli.compress(data, quality=11),
+        }
+
+        written = []
+        for suffix, compressed in variants.items():
+            if len(compressed) >= len(data):
+                continue
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            written.append(name + suffix)
+        return written
@@ -14,13 +14,30 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path
-from blog.views import blog_list, blog_detail, home
+from app.views import skills_detail
+from blog import feeds, views
+
+if settings.ASYNC_VIEWS:
+    home, blog_list, blog_detail = views.ahome, views.ablog_list, views.ablog_detail
+else:
+    home, blog_list, blog_detail = views.home, views.blog_list, views.blog_detail
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', home, name='index'),  # Use the new home view
     path('blog/', blog_list, name='blog-list'),
     path('blog/<int:post_id>/', blog_detail, name='blog_detail'),
+    path('skills/', skills_detail, name='skills'),
+    path('search/', views.search, name='search'),
+    path('csrf/', views.csrf_token, name='csrf-token'),
+    path('blog/feed/', feeds.blog_feed, name='blog-feed'),
+    path('sitemap.xml', feeds.sitemap_index, name='sitemap'),
+    path('sitemap-<int:page>.xml', feeds.sitemap_page, name='sitemap-page'),
 ]
+
+# Uploads are served by the front-end server in production; static() is a no-op unless DEBUG
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)